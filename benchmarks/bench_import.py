@@ -0,0 +1,53 @@
+"""
+Measure the time of `import stateflow` and of the first use (importing and evaluating a simple expression) in fresh
+interpreters, and compare them with budgets meant to catch regressions like importing asyncio again.
+
+Run with `PYTHONPATH=. python benchmarks/bench_import.py` (or with stateflow installed).
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+IMPORT_BUDGET = 0.02  # seconds of `import stateflow`
+FIRST_USE_BUDGET = 0.2  # seconds of importing and evaluating a simple expression
+
+IMPORT_CODE = (
+    "import json, time\n"
+    "t = time.perf_counter()\n"
+    "import stateflow\n"
+    "print(json.dumps(time.perf_counter() - t))\n")
+
+FIRST_USE_CODE = (
+    "import json, time\n"
+    "t = time.perf_counter()\n"
+    "from stateflow import ev, var\n"
+    "a = var(1)\n"
+    "assert ev(a + 1) == 2\n"
+    "a @= 2\n"
+    "assert ev(a + 1) == 3\n"
+    "print(json.dumps(time.perf_counter() - t))\n")
+
+
+def measure(code: str) -> float:
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    over_budget = False
+    print('{:>10} {:>10} {:>10}'.format('workload', 'best [ms]', 'budget'))
+    for name, code, budget in [('import', IMPORT_CODE, IMPORT_BUDGET), ('first use', FIRST_USE_CODE, FIRST_USE_BUDGET)]:
+        best = min(measure(code) for _ in range(args.repeat))
+        over_budget = over_budget or best > budget
+        print('{:>10} {:>10.1f} {:>10.1f}{}'.format(name, best * 1e3, budget * 1e3, '' if best <= budget else ' !'))
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare the refresher queues: `BucketQueue` (used by refreshers) and the heap-based `PriorityQueue`.
+
+Run with `PYTHONPATH=. python benchmarks/bench_queue.py` (or with stateflow installed). Two workloads are measured for graphs of various depths:
+
+* queue: a refresh wave simulated on the queue alone - `width` items at level 0, each taken item puts its successor
+  at the next level (until `depth`),
+* refresh: a real wave through `width` chains of `Notifier`s of length `depth`, with the default refresher using
+  the given queue.
+"""
+
+import argparse
+import heapq
+import timeit
+from typing import List
+
+from stateflow.bucket_queue import BucketQueue, QueueEmpty
+from stateflow.notifier import Notifier
+from stateflow.sync_refresher import QueueItem, get_default_refresher
+
+
+class PriorityQueue:
+    """
+    A non-blocking subset of `asyncio.PriorityQueue` interface on a heap, as refreshers used before `BucketQueue`.
+    """
+
+    def __init__(self):
+        self._heap = []  # type: List[QueueItem]
+
+    def put_nowait(self, item: QueueItem):
+        heapq.heappush(self._heap, item)
+
+    def get_nowait(self) -> QueueItem:
+        if not self._heap:
+            raise QueueEmpty()
+        return heapq.heappop(self._heap)
+
+    def peek(self) -> QueueItem:
+        if not self._heap:
+            raise QueueEmpty()
+        return self._heap[0]
+
+    def qsize(self) -> int:
+        return len(self._heap)
+
+    def empty(self) -> bool:
+        return not self._heap
+
+
+QUEUES = {'heap': PriorityQueue, 'bucket': BucketQueue}
+TOTAL_NODES = 100000
+
+
+def queue_wave(queue_class, depth: int, width: int):
+    queue = queue_class()
+    stats = {}
+    for i in range(width):
+        queue.put_nowait(QueueItem(0, (0, i), None, stats))
+    while not queue.empty():
+        item = queue.get_nowait()
+        level, i = item.id
+        if level + 1 < depth:
+            queue.put_nowait(QueueItem(level + 1, (level + 1, i), None, stats))
+
+
+def make_chains(depth: int, width: int):
+    sink = Notifier(forced_active=True, name='sink')
+    nodes = []  # notifiers are observed weakly, so they are kept here
+    heads = []
+    for _ in range(width):
+        chain = [Notifier() for _ in range(depth)]
+        for observed, observer in zip(chain, chain[1:]):
+            observed.add_observer(observer)
+        chain[-1].add_observer(sink)
+        heads.append(chain[0])
+        nodes.extend(chain)
+    return sink, heads, nodes
+
+
+def refresh_wave(heads):
+    refresher = get_default_refresher()
+    refresher._updates_in_progress += 1
+    for head in heads:
+        head.notify()
+    refresher._updates_in_progress -= 1
+    refresher.maybe_run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--depths', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    refresher = get_default_refresher()
+    refresher.collect_garbage = False
+    print('{:>8} {:>8} {:>8} {:>12} {:>12} {:>8}'.format('workload', 'depth', 'width', 'heap [ms]', 'bucket [ms]',
+                                                         'speedup'))
+    for depth in args.depths:
+        width = max(1, TOTAL_NODES // depth)
+        times = {name: min(timeit.repeat(lambda: queue_wave(queue_class, depth, width), number=1, repeat=args.repeat))
+                 for name, queue_class in QUEUES.items()}
+        print('{:>8} {:>8} {:>8} {:>12.1f} {:>12.1f} {:>7.2f}x'.format(
+            'queue', depth, width, times['heap'] * 1e3, times['bucket'] * 1e3, times['heap'] / times['bucket']))
+
+    for depth in args.depths:
+        width = max(1, TOTAL_NODES // 10 // depth)
+        sink, heads, nodes = make_chains(depth, width)
+        times = {name: float('inf') for name in QUEUES}
+        for _ in range(args.repeat):  # interleaved, so both queues run in the same conditions
+            for name, queue_class in QUEUES.items():
+                refresher.queue = queue_class()
+                times[name] = min(times[name], timeit.timeit(lambda: refresh_wave(heads), number=1))
+        refresher.queue = BucketQueue()
+        print('{:>8} {:>8} {:>8} {:>12.1f} {:>12.1f} {:>7.2f}x'.format(
+            'refresh', depth, width, times['heap'] * 1e3, times['bucket'] * 1e3, times['heap'] / times['bucket']))
+
+
+if __name__ == '__main__':
+    main()
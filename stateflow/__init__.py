@@ -1,14 +1,54 @@
 name = "stateflow"
 
-from stateflow.common import Observable, assign, ev, ev_def, ev_exception, ev_one
-from stateflow.decorators import reactive
-from stateflow.errors import ArgEvalError, BodyEvalError, NotAssignable, NotInitializedError, ValidationError, EvError
-from stateflow.notifier import Notifier
-from stateflow.utils import *
+import sys
+import types
+from importlib import import_module
 
-__all__ = ['Observable', 'assign', 'ev', 'ev_def', 'ev_exception', 'ev_one', 'reactive',
+# The public API is imported lazily (on the first access), so `import stateflow` is cheap. It matters for short-lived
+# processes that use only a part of the library.
+_LAZY_ATTRIBUTES = {
+    'stateflow.common': ['Observable', 'assign', 'ev', 'ev_def', 'ev_exception', 'ev_one'],
+    'stateflow.computed': ['computed'],
+    'stateflow.decorators': ['reactive'],
+    'stateflow.errors': ['ArgEvalError', 'BodyEvalError', 'NotAssignable', 'NotInitializedError', 'ValidationError',
+                         'EvError'],
+    'stateflow.notifier': ['Notifier'],
+    'stateflow.rate_limit': ['debounce', 'throttle'],
+    'stateflow.selector': ['select'],
+    'stateflow.utils': ['T', 'is_observable', 'ACTIVE_NOTIFIER', 'Const', 'NotifiedProxy', 'Var', 'set_if_inequal',
+                        'bind_vars', 'VolatileProxy', 'volatile', 'const', 'var', 'validate_arg', 'not_none',
+                        'make_list', 'make_tuple', 'make_dict', 'rewrap_dict'],
+}
+_ATTRIBUTE_MODULES = {attribute: module for module, attributes in _LAZY_ATTRIBUTES.items() for attribute in attributes}
+
+__all__ = ['Observable', 'assign', 'ev', 'ev_def', 'ev_exception', 'ev_one', 'computed', 'reactive',
            'ArgEvalError', 'BodyEvalError', 'NotAssignable', 'NotInitializedError', 'ValidationError', 'EvError',
-           'Notifier']
+           'Notifier', 'debounce', 'throttle', 'select']
+
+
+def __getattr__(attribute):
+    module = _ATTRIBUTE_MODULES.get(attribute)
+    if module is None:
+        raise AttributeError("module 'stateflow' has no attribute '{}'".format(attribute))
+    value = getattr(import_module(module), attribute)
+    globals()[attribute] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ATTRIBUTE_MODULES))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, attribute, value):
+        # `stateflow.var` is the `var()` function, not the submodule (the import system sets the submodule as an
+        # attribute of the package once it's loaded)
+        if isinstance(value, types.ModuleType) and attribute in _ATTRIBUTE_MODULES:
+            return
+        super().__setattr__(attribute, value)
+
+
+sys.modules[__name__].__class__ = _Package
 
 
 BLEH="""Traceback (most recent call last):
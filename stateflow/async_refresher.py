@@ -6,6 +6,9 @@ from typing import Any, NamedTuple
 
 import sys
 
+from stateflow.bucket_queue import BucketQueue, QueueEmpty
+from stateflow.tracing import active_subscribers
+
 # stderr_logger_handler = logging.StreamHandler(stream=sys.stderr)
 # stderr_logger_handler.setLevel(logging.DEBUG)
 logger = logging.getLogger('refresher')
@@ -24,9 +27,13 @@ class QueueItem(NamedTuple):
 
 
 class AsyncRefresher:
+    # run `gc.collect()` before and after each run (not needed if subgraphs are disposed with `Scope`)
+    collect_garbage = True
+
     def __init__(self):
-        self.queue = asyncio.PriorityQueue()
+        self.queue = BucketQueue()
         self.task = None  # type: asyncio.Task
+        self._updates_in_progress = 0  # open `UpdateTransaction`s; calls are deferred until they are closed
 
     def maybe_start_task(self):
         if not self.task or self.task.done():
@@ -44,53 +51,51 @@ class AsyncRefresher:
             raise e
 
     def schedule_call(self, notifier: 'Notifier'):
-        logger.debug('  scheduled notification ({}) [{:X}] {}'.format(notifier.priority, id(notifier), notifier.name))
+        if active_subscribers:
+            for subscriber in active_subscribers:
+                subscriber.on_schedule(notifier)
         t = QueueItem(notifier.priority, notifier, notifier, notifier.stats)
         self.queue.put_nowait(t)
-        self.maybe_start_task()
-
-    async def run(self):
-        gc.collect()
-        update_next = None
+        if self._updates_in_progress == 0:
+            self.maybe_start_task()
 
-        notified_notifiers = set()
-        with suppress(asyncio.QueueEmpty):  # it's ok - if the queue is empty we just exit
-            while True:
-                notification = update_next if update_next else self.queue.get_nowait()  # type: QueueItem
-                try:
-                    update_next = self.queue.get_nowait()
-                    if update_next.id == notification.id:  # skip notification if is same as next
-                        continue
-                except asyncio.QueueEmpty:
-                    update_next = None
+    def maybe_run(self):
+        """Start a wave if there are queued calls and no updates in progress (called when a transaction ends)."""
+        if self._updates_in_progress == 0 and not self.queue.empty():
+            self.maybe_start_task()
 
+    async def run(self):
+        if self.collect_garbage:
+            gc.collect()
+        if active_subscribers:
+            for subscriber in active_subscribers:
+                subscriber.on_wave_begin(self)
+        with suppress(QueueEmpty):  # it's ok - if the queue is empty we just exit
+            while self._updates_in_progress == 0:  # a transaction opened during the wave defers the rest to its end
+                notification = self.queue.get_nowait()  # type: QueueItem  # the queue keeps no duplicates
+                notifier = notification.notifier
+                exception = None
+                if active_subscribers:
+                    for subscriber in active_subscribers:
+                        subscriber.on_call_begin(notifier)
                 try:
                     notification.stats['calls'] = notification.stats.get('calls', 0) + 1
-                    notifier = notification.notifier
-                    if notifier in notified_notifiers:
-                        logger.debug('notifier [{:X}] {} called more than once'.format(id(notifier), notifier.name))
-                    notified_notifiers.add(notifier)
-                    logger.debug('call notification ({}) [{:X}] {}'.format(notifier.priority, id(notifier),
-                                                                           notifier.name))
-
+                    # the notifier notifies its observers itself (if it's active and possibly changed)
                     res = notifier.call()
                     if asyncio.iscoroutine(res):
-                        res = await res
-                    notification.stats['exception'] = None
-
-                    assert isinstance(res, bool), "res has type {}, should be bool for {}".format(type(res),
-                                                                                                  notifier.name)
-                    if res:
-                        logger.debug(' notification finished with True, notifying observers')
-                        notification.notifier.notify_observers()
-                        logger.debug(' finished')
-                    else:
-                        logger.debug(' notification finished with False')
-
+                        await res
                 except Exception as e:
-                    logger.exception('ignoring exception when in notifying observer {}'.format(notification.notifier))
-                    notification.stats['exception'] = e
-        gc.collect()
+                    logger.exception('ignoring exception when in notifying observer {}'.format(notifier))
+                    exception = e
+                notification.stats['exception'] = exception
+                if active_subscribers:
+                    for subscriber in active_subscribers:
+                        subscriber.on_call_end(notifier, exception)
+        if active_subscribers:
+            for subscriber in active_subscribers:
+                subscriber.on_wave_end(self)
+        if self.collect_garbage:
+            gc.collect()
 
 
 refresher = None
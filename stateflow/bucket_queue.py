@@ -0,0 +1,82 @@
+"""
+The queue of notifications used by refreshers.
+"""
+
+from typing import List, Set
+
+
+class QueueEmpty(Exception):
+    pass
+
+
+class BucketQueue:
+    """
+    A priority queue of `QueueItem`s for small non-negative integer priorities (notifier priorities are depths in the
+    graph). Items are kept in a list per priority level; getting an item takes the whole lowest non-empty level at once
+    (swapping it with an empty list) and pops items from it, so both putting and getting are O(1) amortized and no
+    items are compared.
+
+    An item whose `id` is already queued is not added again (the notifier is going to be called anyway).
+    """
+
+    def __init__(self):
+        self._levels = []  # type: List[list]
+        self._min_level = 0  # there are no items in levels below it
+        self._batch = []  # the level being taken from (reversed, so it's popped from the end)
+        self._batch_level = 0
+        self._size = 0
+        self._queued = set()  # type: Set  # ids of the queued items
+        self.deduplicated = 0
+
+    def put_nowait(self, item):
+        if item.id in self._queued:
+            self.deduplicated += 1
+            return
+        self._queued.add(item.id)
+        priority = item.priority
+        levels = self._levels
+        if priority >= len(levels):
+            levels.extend([] for _ in range(priority + 1 - len(levels)))
+        levels[priority].append(item)
+        if priority < self._min_level:
+            self._min_level = priority
+        self._size += 1
+
+    def get_nowait(self):
+        if not self._size:
+            raise QueueEmpty()
+        if not self._batch or self._min_level < self._batch_level:
+            self._take_lowest_level()
+        item = self._batch.pop()
+        self._size -= 1
+        self._queued.discard(item.id)
+        return item
+
+    def peek(self):
+        if not self._size:
+            raise QueueEmpty()
+        if not self._batch or self._min_level < self._batch_level:
+            self._take_lowest_level()
+        return self._batch[-1]
+
+    def _take_lowest_level(self):
+        levels = self._levels
+        if self._batch:
+            # something was put below the level being taken from, it's continued later
+            self._batch.reverse()
+            levels[self._batch_level][:0] = self._batch
+        level = self._min_level
+        while not levels[level]:
+            level += 1
+        batch = levels[level]
+        levels[level] = []
+        batch.reverse()
+        self._batch = batch
+        self._batch_level = level
+        self._min_level = level
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return not self._size
@@ -0,0 +1,117 @@
+"""
+A memory budget for values kept by `Cache` nodes.
+"""
+
+import logging
+import sys
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger('cache_manager')
+
+manager = None  # type: Optional[CacheManager]
+
+
+def value_size(value) -> int:
+    """The size of `value` in bytes: `nbytes` if it has one (e.g. NumPy arrays), `sys.getsizeof` otherwise."""
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+class CacheManager:
+    """
+    Tracks sizes of values kept by `Cache` nodes and, when their total exceeds `max_bytes`, evicts the least recently
+    read ones. An evicted cache drops its value and becomes invalid without notifying its dependents (the value hasn't
+    changed); it's recomputed on the next read.
+
+    Caches of context manager (and generator) results are not tracked: the value is held by the entered context anyway.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.recomputations = 0  # reads of evicted caches
+        self._entries = OrderedDict()  # type: Dict[int, weakref.ref]  # from the least recently read
+        self._sizes = {}  # type: Dict[int, int]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {'entries': len(self._entries), 'total_bytes': self.total_bytes, 'max_bytes': self.max_bytes,
+                'evictions': self.evictions, 'evicted_bytes': self.evicted_bytes,
+                'recomputations': self.recomputations}
+
+    def read(self, cache, value, recomputed: bool):
+        """Called by `cache` whenever it's read; `recomputed` tells whether `value` was just computed."""
+        key = id(cache)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            if not recomputed:
+                return
+            self.total_bytes -= self._sizes[key]
+        elif not recomputed or not self._is_evictable(cache):
+            return
+        else:
+            self._entries[key] = weakref.ref(cache, lambda _, key=key: self._remove(key))
+        size = value_size(value)
+        self._sizes[key] = size
+        self.total_bytes += size
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def discard(self, cache):
+        """Called when `cache` is invalidated (its value is not kept anymore)."""
+        self._remove(id(cache))
+
+    def _remove(self, key: int):
+        if self._entries.pop(key, None) is not None:
+            self.total_bytes -= self._sizes.pop(key)
+
+    @staticmethod
+    def _is_evictable(cache) -> bool:
+        from stateflow.call_result import CmCallResult
+        return not isinstance(cache._inner, CmCallResult)
+
+    def _evict(self):
+        # the most recently read value is kept, even if it doesn't fit alone
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, ref = self._entries.popitem(last=False)
+            size = self._sizes.pop(key)
+            self.total_bytes -= size
+            cache = ref()
+            if cache is None:
+                continue
+            cache._evict()
+            self.evictions += 1
+            self.evicted_bytes += size
+            logger.debug('evicted %s (%d bytes)', cache._notifier.name, size)
+
+
+def enable_cache_manager(max_bytes: int) -> CacheManager:
+    """
+    Start tracking values of caches with a budget of `max_bytes` and return the manager. If it's already enabled, the
+    budget is changed (and values evicted if needed).
+    """
+    global manager
+    if manager is None:
+        manager = CacheManager(max_bytes)
+    else:
+        manager.max_bytes = max_bytes
+        manager._evict()
+    return manager
+
+
+def disable_cache_manager():
+    """Stop tracking cached values (they are kept until invalidated, as without the manager)."""
+    global manager
+    manager = None
+
+
+def get_cache_manager() -> Optional[CacheManager]:
+    return manager
@@ -1,14 +1,14 @@
-import asyncio
 import logging
 import traceback
 from abc import abstractmethod
 from itertools import chain
-from typing import Any, Dict, List, Mapping, Sequence, Set, Tuple, Callable
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Callable
 
 from stateflow.common import Observable, T, ev, is_observable
 from stateflow.errors import ArgEvalError, BodyEvalError, raise_need_async_eval, EvError
 from stateflow.internal_utils import bind_arguments
 from stateflow.notifier import Notifier
+from stateflow.scope import active_scopes
 
 
 
@@ -75,6 +75,20 @@ def observe_args(args_helper: ArgsHelper, pass_args: Set[str], notifier):
             maybe_observe(arg, notifier)
 
 
+def _versioned_deps(args_helper: ArgsHelper, decorator_params) -> Optional[List[Observable]]:
+    """
+    Observable arguments, if each of them keeps a version (otherwise None). Observables passed unevaluated (in
+    `pass_args`) may be read in any way by the function, and notifications of `dep_only_args` and `other_deps` mean
+    "call again" by themselves, so versions are not used with them.
+    """
+    if decorator_params.pass_args or decorator_params.dep_only_args or decorator_params.other_deps:
+        return None
+    deps = [arg for _, _, arg in chain(args_helper.iterate_args(), args_helper.iterate_kwargs()) if is_observable(arg)]
+    if any(dep._version is None for dep in deps):
+        return None
+    return deps
+
+
 def callable_name(c: Callable):
     if hasattr(c, '__name__'):
         return c.__name__
@@ -88,7 +102,7 @@ class CallResult(Observable[T]):
     """
     def __init__(self, reactive_function: 'ReactiveFunction', args, kwargs):
         self.reactive_function = reactive_function
-        self._notifier = Notifier()
+        self._notifier = Notifier(owner=reactive_function)
         self._notifier.name = 'CallResult of {}'.format(callable_name(reactive_function.callable))
 
         # use dep_only_args
@@ -114,6 +128,9 @@ class CallResult(Observable[T]):
         self.call_stack = traceback.extract_stack()[:-3]
 
         observe_args(self.args_helper, self.reactive_function.decorator_params.pass_args, self.__notifier__())
+        self._versioned_deps = _versioned_deps(self.args_helper, reactive_function.decorator_params)
+        if active_scopes:
+            active_scopes[-1].own_observable(self)
 
     def __notifier__(self):
         return self._notifier
@@ -164,8 +181,30 @@ class CallResult(Observable[T]):
 
 
 class SyncCallResult(CallResult[T]):
+    """
+    Remembers versions of the dependencies used by the last call (if all of them keep versions), so a `Cache` of it
+    can tell a notification that didn't change any argument (see `is_up_to_date`). The result itself is kept only by
+    the cache.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._used_versions = None  # type: Optional[tuple]
+
     def __eval__(self):
-        return self._call()
+        deps = self._versioned_deps
+        if deps is None:
+            return self._call()
+        versions = tuple([dep._version for dep in deps])
+        self._used_versions = None
+        result = self._call()
+        self._used_versions = versions
+        return result
+
+    def is_up_to_date(self) -> bool:
+        """Whether the last call succeeded with the current versions of all the dependencies."""
+        return self._used_versions is not None and \
+            self._used_versions == tuple([dep._version for dep in self._versioned_deps])
 
 
 class AsyncCallResult(CallResult[T]):
@@ -209,6 +248,7 @@ class AsyncCmCallResult(CallResult[T]):
         return await self.cm.__aenter__()
 
     def __del__(self):
+        import asyncio
         asyncio.ensure_future(self.__afinalize__())
 
     async def __afinalize__(self):
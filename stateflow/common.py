@@ -1,6 +1,7 @@
-import asyncio
+import inspect
+import threading
 from abc import abstractmethod
-from typing import Callable, Coroutine, Generic, TypeVar, Union
+from typing import Callable, Coroutine, Generic, List, Optional, TypeVar, Union
 
 from stateflow.errors import ArgEvalError, BodyEvalError, EvError, NotAssignable
 
@@ -9,9 +10,18 @@ FULL_TRACEBACKS = False
 REPR_EVALUATES = False
 deprecated_interactive_mode = False
 
+class _Tracking(threading.local):
+    def __init__(self):
+        # observables read with `ev` are appended to the innermost list (see `Computed`); None stops recording while a
+        # read observable is being evaluated (its own reads are not dependencies of the reader)
+        self.frames = []  # type: List[Optional[list]]
+
+
+tracking = _Tracking()  # per thread: graphs in other threads are evaluated independently
+
 
 def ensure_coro_func(f):
-    if asyncio.iscoroutinefunction(f):
+    if inspect.iscoroutinefunction(f):
         return f
     elif hasattr(f, '__call__'):
         async def async_f(*args, **kwargs):
@@ -29,6 +39,7 @@ T = TypeVar('T')
 
 class Observable(Generic[T]):
     repr_name = 'Observable'
+    _version = None  # a counter increased with each change of the value, if the observable keeps one
 
     @abstractmethod
     def __notifier__(self) -> 'Notifier':
@@ -114,6 +125,14 @@ def is_observable(v):
 
 def ev_one(v: Observable[T]) -> T:
     assert is_observable(v)
+    frames = tracking.frames
+    if frames and frames[-1] is not None:
+        frames[-1].append(v)
+        frames.append(None)
+        try:
+            return ev_one(v)
+        finally:
+            frames.pop()
     # BodyEvalError and ArgEvalError are handled in a special way to
     try:
         v.__notifier__().refresh()  # FIXME: why do we need this? shouldn't eval force to evaluate
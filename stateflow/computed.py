@@ -0,0 +1,108 @@
+"""
+Functions that depend on observables they actually read.
+"""
+
+import functools
+import traceback
+from typing import Callable, Dict, List
+
+from stateflow.common import Observable, T, tracking
+from stateflow.errors import BodyEvalError
+from stateflow.forwarders import ConstForwarders
+from stateflow.notifier import Notifier
+from stateflow.scope import active_scopes
+
+
+class Computed(Observable[T], ConstForwarders):
+    """
+    The result of a `computed` function. The function reads observables with `ev()`; those read by the last call are
+    the dependencies, observed until the next call. An observable not read by the last call (e.g. in a branch not
+    taken) doesn't cause calls and isn't kept active by this node.
+
+    The value is cached like in `Cache`: the function is called on the first read after a dependency has notified.
+    """
+
+    repr_name = 'Computed'
+
+    def __init__(self, func: Callable[..., T], args: tuple, kwargs: dict):
+        super().__init__()
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._deps = {}  # type: Dict[int, Observable]  # from ids, in the order of the first read
+        self._is_valid = False
+        self._value = None
+        self._exception = None
+        self._version = 0  # increased whenever a dependency notifies, as in `Cache`
+        self.calls = 0
+        self._notifier = Notifier(self._invalidate, name='Computed {}'.format(getattr(func, '__name__', '?')),
+                                  owner=self)
+        self.call_stack = traceback.extract_stack()[:-2]
+        if active_scopes:
+            active_scopes[-1].own_observable(self)
+
+    def __notifier__(self) -> Notifier:
+        return self._notifier
+
+    @property
+    def dependencies(self) -> List[Observable]:
+        """Observables read by the last call."""
+        return list(self._deps.values())
+
+    def _invalidate(self) -> bool:
+        self._version += 1
+        if not self._is_valid:
+            # as in `Cache`, dependents didn't read the value since the last invalidation
+            return False
+        self._is_valid = False
+        self._value = None
+        return True
+
+    def __eval__(self) -> T:
+        if not self._is_valid:
+            self._call()
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+    def _call(self):
+        read = []
+        frames = tracking.frames
+        frames.append(read)
+        try:
+            self.calls += 1
+            self._value = self._func(*self._args, **self._kwargs)
+            self._exception = None
+        except Exception as e:
+            self._value = None
+            self._exception = BodyEvalError(self.call_stack, e.with_traceback(e.__traceback__.tb_next))
+        finally:
+            frames.pop()
+        self._is_valid = True
+        self._resubscribe(read)
+
+    def _resubscribe(self, read: List[Observable]):
+        deps = {}  # type: Dict[int, Observable]
+        for observable in read:
+            deps.setdefault(id(observable), observable)
+        for key, observable in self._deps.items():
+            if key not in deps:
+                observable.__notifier__().remove_observer(self._notifier)
+        for key, observable in deps.items():
+            if key not in self._deps:
+                observable.__notifier__().add_observer(self._notifier)
+        self._deps = deps
+
+
+def computed(func: Callable[..., T]) -> Callable[..., Computed[T]]:
+    """
+    Decorate a function whose dependencies are the observables it reads with `ev()`, unlike in `reactive` functions,
+    where all observable arguments are dependencies. Arguments are passed as they are (observables aren't evaluated).
+    E.g. `choose()` of a function returning `ev(b) if ev(flag) else ev(c)` depends on `flag` and one of `b` and `c`.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Computed[T]:
+        return Computed(func, args, kwargs)
+
+    return wrapper
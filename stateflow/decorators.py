@@ -1,12 +1,11 @@
-import asyncio
 import contextlib
 import functools
 import inspect
 import logging
+import os
+import warnings
 from typing import Callable, Sequence, Union, overload
 
-from typing_extensions import deprecated
-
 from stateflow.call_result import CmCallResult
 from stateflow.common import CoroutineFunction, T, is_observable
 from stateflow.function import AsyncReactiveFunction, DecoratorParams, ReactiveCmFunction, SyncReactiveFunction
@@ -15,9 +14,14 @@ from stateflow.function import AsyncReactiveFunction, DecoratorParams, ReactiveC
 
 
 
-@deprecated("Use ReactiveFunctionBase-derived classes")
 class DecoratedFunction:
+    """
+    Deprecated: use `ReactiveFunction`-derived classes.
+    """
+
     def __init__(self, factory, func: Union[CoroutineFunction, Callable], decorator_params: DecoratorParams):
+        # not `typing_extensions.deprecated`, since importing it takes more time than the rest of this module
+        warnings.warn("Use ReactiveFunctionBase-derived classes", DeprecationWarning, stacklevel=2)
         self.factory = factory
         self.callable = func
         self.decorator = decorator_params
@@ -60,22 +64,34 @@ def reactive(f: Callable) -> Callable:
 @overload
 def reactive(pass_args: Sequence[str] = None,
              other_deps: Sequence[str] = None,
-             dep_only_args: Sequence[str] = None) -> Callable:
+             dep_only_args: Sequence[str] = None,
+             disk_cache: Union[str, os.PathLike, 'DiskCache'] = None) -> Callable:
     pass
 
 
 
 def reactive(pass_args: Sequence[str] = None,
              other_deps: Sequence[str] = None,
-             dep_only_args: Sequence[str] = None):
+             dep_only_args: Sequence[str] = None,
+             disk_cache: Union[str, os.PathLike, 'DiskCache'] = None):
+    """
+    Arguments:
+        disk_cache: A directory (or a `DiskCache`) where results are stored, keyed by the function code and evaluated
+                    arguments. The stored result is returned instead of calling the function with the same arguments
+                    again, also after the process restarts.
+    """
     if callable(pass_args):
         # a shortcut that allows simple @reactive instead of @reactive()
         return reactive()(pass_args)
+    if disk_cache is not None:
+        from stateflow.disk_cache import as_disk_cache  # not needed by most of functions, so imported lazily
+        disk_cache = as_disk_cache(disk_cache)
 
     decorator_params = DecoratorParams(
         pass_args=set(pass_args or []),
         dep_only_args=set(dep_only_args or []),
-        other_deps=other_deps or []
+        other_deps=other_deps or [],
+        disk_cache=disk_cache
     )
 
 
@@ -84,7 +100,10 @@ def reactive(pass_args: Sequence[str] = None,
         Decorate the function.
         """
         # FIXME: put every creating code into a function
-        if asyncio.iscoroutinefunction(func):
+        if decorator_params.disk_cache is not None and (inspect.iscoroutinefunction(func)
+                                                        or inspect.isgeneratorfunction(func)):
+            raise TypeError("disk_cache is supported only for ordinary functions (got {})".format(repr(func)))
+        if inspect.iscoroutinefunction(func):
             return AsyncReactiveFunction(func, decorator_params)
         elif inspect.isgeneratorfunction(func):
             return ReactiveCmFunction(contextlib.contextmanager(func), decorator_params)
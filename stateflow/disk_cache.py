@@ -0,0 +1,212 @@
+"""
+Persistent on-disk cache of results of reactive functions (see `reactive(disk_cache=...)`).
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Callable, Mapping, Optional, Sequence, Tuple
+
+from stateflow.internal_utils import optional_numpy
+
+logger = logging.getLogger('disk_cache')
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def function_fingerprint(func: Callable) -> Optional[bytes]:
+    """
+    Return bytes identifying the code of `func` or None if it cannot be identified. Note that values of the closure
+    and globals used by the function are not part of the fingerprint.
+    """
+    name = '{}.{}'.format(getattr(func, '__module__', None), getattr(func, '__qualname__', None)).encode()
+    code = getattr(func, '__code__', None)
+    if code is not None:
+        return name + b'\0' + marshal.dumps(code)
+    if callable(func) and getattr(func, '__qualname__', None) is not None:
+        return name  # e.g. builtins
+    return None
+
+
+class _Normalized(tuple):
+    """A set or a dict as a sorted tuple (of type name and items); pickled differently than a plain tuple."""
+
+
+def _pickled(value) -> bytes:
+    return pickle.dumps(value, protocol=4)
+
+
+def _normalized(value):
+    """
+    `value` with sets, frozensets and dicts (also nested in lists and tuples) replaced by their items in a stable order,
+    so equal arguments are pickled the same way in every process (the order of sets of strings depends on the hash
+    seed, and the order of dicts on the order of insertions).
+    """
+    t = type(value)
+    if t is set or t is frozenset:
+        return _Normalized((t.__name__, tuple(sorted((_normalized(item) for item in value), key=_pickled))))
+    if t is dict:
+        items = ((_normalized(k), _normalized(v)) for k, v in value.items())
+        return _Normalized(('dict', tuple(sorted(items, key=lambda item: _pickled(item[0])))))
+    if t is list or t is tuple:
+        return t(_normalized(item) for item in value)
+    return value
+
+
+class DiskCache:
+    """
+    Results of function calls stored in files in the `path` directory, keyed by a hash of the function code and the
+    evaluated arguments. When the total size of files exceeds `max_bytes`, the least recently used ones are removed.
+
+    NumPy arrays are stored as `.npy` files and memory-mapped on load (copy-on-write: the result is writable like a
+    computed one, but changes are not written to the file); other values are pickled.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None  # type: Optional[int]
+        self._last_used_ns = 0
+        os.makedirs(path, exist_ok=True)
+
+    def make_key(self, func: Callable, args: Sequence[Any], kwargs: Mapping[str, Any]) -> Optional[str]:
+        """
+        Return the key of the call or None if the call cannot be cached (e.g. arguments can't be pickled). Keys are
+        stable across processes for arguments made of numbers, strings, bytes, NumPy arrays and lists, tuples, sets and
+        dicts of them; other objects are keyed by their pickled state, which may depend on the process (e.g. if it
+        contains sets).
+        """
+        fingerprint = function_fingerprint(func)
+        if fingerprint is None:
+            return None
+        try:
+            args_bytes = _pickled(_normalized((tuple(args), dict(kwargs))))
+        except Exception as e:
+            logger.debug('not caching call of {}: {}'.format(getattr(func, '__qualname__', func), e))
+            return None
+        h = hashlib.sha256(fingerprint)
+        h.update(args_bytes)
+        return h.hexdigest()
+
+    def _file(self, key: str, ext: str) -> str:
+        return os.path.join(self.path, key + ext)
+
+    def get(self, key: Optional[str]) -> Tuple[bool, Any]:
+        """Return `(True, value)` if there is a value for `key` or `(False, None)` otherwise."""
+        if key is None:
+            return False, None
+        for ext, load in (('.npy', self._load_array), ('.pkl', self._load_pickle)):
+            filename = self._file(key, ext)
+            try:
+                value = load(filename)
+            except FileNotFoundError:
+                continue
+            except Exception:
+                logger.exception('ignoring broken cache entry {}'.format(filename))
+                continue
+            self.hits += 1
+            self._touch(filename)
+            return True, value
+        self.misses += 1
+        return False, None
+
+    @staticmethod
+    def _load_array(filename):
+        np = optional_numpy()
+        if np is None:
+            raise FileNotFoundError(filename)
+        return np.load(filename, mmap_mode='c', allow_pickle=False)
+
+    @staticmethod
+    def _load_pickle(filename):
+        with open(filename, 'rb') as f:
+            return pickle.load(f)
+
+    def put(self, key: Optional[str], value: Any):
+        """Store `value` under `key`. Values that cannot be stored are silently skipped."""
+        if key is None:
+            return
+        np = optional_numpy()
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if np is not None and isinstance(value, np.ndarray) and not value.dtype.hasobject:
+                    np.save(f, value, allow_pickle=False)
+                    ext = '.npy'
+                else:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    ext = '.pkl'
+            size = os.path.getsize(tmp_name)
+            filename = self._file(key, ext)
+            os.replace(tmp_name, filename)
+            self._touch(filename)
+        except Exception as e:
+            logger.debug('not caching value of type {}: {}'.format(type(value).__name__, e))
+            _remove_quietly(tmp_name)
+            return
+        if self._size is not None:
+            self._size += size
+        self._evict_if_needed()
+
+    def _touch(self, filename: str):
+        """Mark the entry as recently used (the modification time is used as the LRU order)."""
+        # file timestamps set by the filesystem may be coarse, so use an explicit, strictly increasing one
+        self._last_used_ns = max(time.time_ns(), self._last_used_ns + 1)
+        try:
+            os.utime(filename, ns=(self._last_used_ns, self._last_used_ns))
+        except OSError:
+            pass
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.name.endswith(('.npy', '.pkl')):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _evict_if_needed(self):
+        if self._size is not None and self._size <= self.max_bytes:
+            return
+        entries = self._entries()
+        self._size = sum(size for _, size, _ in entries)
+        if self._size <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, filename in entries:
+            if self._size <= self.max_bytes:
+                break
+            _remove_quietly(filename)
+            self._size -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries."""
+        for _, _, filename in self._entries():
+            _remove_quietly(filename)
+        self._size = 0
+
+
+def _remove_quietly(filename: str):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+def as_disk_cache(disk_cache) -> Optional[DiskCache]:
+    """Accept a `DiskCache`, a directory path or None (no caching)."""
+    if disk_cache is None or isinstance(disk_cache, DiskCache):
+        return disk_cache
+    return DiskCache(os.fspath(disk_cache))
@@ -5,7 +5,8 @@ from math import ceil, floor
 
 from stateflow.decorators import reactive
 from stateflow.common import T, Observable, assign, ev_one
-from stateflow.wrapping import add_assignop_forwarders, add_notifying_forwarders, add_reactive_forwarders
+from stateflow.wrapping import add_assignop_forwarders, add_notifying_forwarders, add_reactive_forwarders, \
+    interned_forwarder
 
 UNARY_OPERATORS = [
     ('__neg__', operator.__neg__),
@@ -74,11 +75,14 @@ OTHER_NONMODYFING_0ARG = [
 ]
 
 OTHER_NONMODYFING_1ARG = [
-    ('__getitem__', operator.getitem),
     # ('__missing__',
     ('__contains__', operator.contains),
 ]
 
+INTERNED_1ARG = [
+    ('__getitem__', operator.getitem),
+]
+
 ASSIGN_MOD_OPERATORS = [
     # arith
     ('__iadd__', operator.__iadd__),
@@ -106,6 +110,16 @@ OTHER_MODYFING_2ARG = [
 ]
 
 
+@reactive
+def _forward_getattr(obj, item):
+    """
+    The argument `obj` is evaluated inside this call so there is not infinite recursion (`obj` is no more of
+    `ConstForwarders` class).
+    """
+    # This one is not necessary const. But it may be. We don't know.
+    return getattr(obj, item)
+
+
 class ForwardersBase:
     @abstractmethod
     def _target(self):
@@ -147,14 +161,9 @@ class ConstForwarders(ForwardersBase):
         # This one is not necessary const. But it may be. We don't know.
         return self.__call__(*args, **kwargs)
 
-    @reactive
     def __getattr__(self, item):
-        """
-        The argument `self` is evaluated inside this call so there is not infinite recursion (`self` is no more of
-        `ConstForwarders` class).
-        """
-        # This one is not necessary const. But it may be. We don't know.
-        return getattr(self, item)
+        # the same node is returned for repeated accesses (as long as it's used somewhere)
+        return interned_forwarder(self, '__getattr__', item, lambda: _forward_getattr(self, item))
 
 
 class MutatingForwarders(ForwardersBase):
@@ -173,6 +182,7 @@ class MutatingForwarders(ForwardersBase):
 
 add_reactive_forwarders(ConstForwarders, UNARY_OPERATORS + OTHER_NONMODYFING_0ARG)
 add_reactive_forwarders(ConstForwarders, BINARY_OPERATORS + CMP_OPERATORS + OTHER_NONMODYFING_1ARG)
+add_reactive_forwarders(ConstForwarders, INTERNED_1ARG, interned=True)
 
 add_assignop_forwarders(ConstForwarders, ASSIGN_MOD_OPERATORS)
 add_notifying_forwarders(MutatingForwarders, OTHER_MODYFING_1ARG + OTHER_MODYFING_2ARG)
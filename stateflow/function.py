@@ -33,6 +33,7 @@ class DecoratorParams(NamedTuple):
     pass_args: set[str] = None,
     other_deps: set[str] = None,
     dep_only_args: Sequence[str] = None
+    disk_cache: 'DiskCache' = None
 
 
 class ReactiveFunction:
@@ -52,7 +53,16 @@ class ReactiveFunction:
         functools.update_wrapper(self, func)
 
     def really_call(self, args, kwargs):
-        return self.callable(*args, **kwargs)
+        disk_cache = self.decorator_params.disk_cache
+        if disk_cache is None:
+            return self.callable(*args, **kwargs)
+        key = disk_cache.make_key(self.callable, args, kwargs)
+        found, value = disk_cache.get(key)
+        if found:
+            return value
+        value = self.callable(*args, **kwargs)
+        disk_cache.put(key, value)
+        return value
 
     def __get__(self, instance, instancetype):
         """
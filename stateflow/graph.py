@@ -0,0 +1,107 @@
+"""
+Independent partitions of the notifier graph, each refreshed by its own refresher (possibly in its own thread).
+"""
+
+import threading
+import weakref
+from collections import deque
+from typing import List, Optional
+
+from stateflow.sync_refresher import SyncRefresher, UpdateTransaction
+
+active_graphs = []  # type: List[Graph]  # a stack of entered graphs; new notifiers are bound to the innermost one
+
+
+class Graph:
+    """
+    A partition of the notifier graph with its own refresher. Notifiers created while the graph is entered (with
+    `with graph:`) are bound to it: their notifications are scheduled in `graph.refresher` instead of the default
+    (global) one, so unrelated partitions don't share a queue and don't block each other. Notifiers created outside
+    any graph use the default refresher, as before.
+
+    By default the graph is refreshed in whatever thread notifies it. After `bind_thread()` (or inside `serve()`)
+    notifications coming from other threads (e.g. through edges between partitions, or `call_soon()`) are queued and
+    processed in the bound thread: by `process_pending()` or `serve()`, or by the bound event loop. Values should be
+    read across partitions only from vars and caches (not from functions that would be evaluated in a foreign thread).
+    """
+
+    def __init__(self, name: str = '', refresher=None):
+        self.name = name
+        self.refresher = refresher if refresher is not None else SyncRefresher()
+        self.thread_id = None  # type: Optional[int]
+        self.loop = None
+        self.cross_thread_calls = 0
+        self._notifiers = weakref.WeakSet()
+        self._inbox = deque()
+        self._wakeup = threading.Event()
+
+    def __enter__(self) -> 'Graph':
+        active_graphs.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        assert active_graphs[-1] is self, "graphs should be exited in the reverse order"
+        active_graphs.pop()
+
+    def __repr__(self):
+        return "<Graph name={} thread={}>".format(self.name, self.thread_id)
+
+    def own_notifier(self, notifier):
+        self._notifiers.add(notifier)
+
+    def notifiers(self) -> list:
+        """Living notifiers bound to the graph."""
+        return list(self._notifiers)
+
+    def bind_thread(self, loop=None):
+        """
+        Make the current thread the one that refreshes this graph. If `loop` is given (e.g. for an `AsyncRefresher`),
+        calls from other threads are passed with `loop.call_soon_threadsafe`.
+        """
+        self.thread_id = threading.get_ident()
+        self.loop = loop
+
+    def transaction(self) -> UpdateTransaction:
+        return UpdateTransaction(self.refresher)
+
+    def schedule_call(self, notifier):
+        self.call_soon(self.refresher.schedule_call, notifier)
+
+    def call_soon(self, func, *args):
+        """Call `func(*args)` in the graph's thread: immediately if it's the current one, otherwise it's queued."""
+        if self.thread_id is None or self.thread_id == threading.get_ident():
+            func(*args)
+            return
+        self.cross_thread_calls += 1
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(func, *args)
+        else:
+            self._inbox.append((func, args))
+            if not self._wakeup.is_set():
+                self._wakeup.set()
+
+    def pending(self) -> int:
+        return len(self._inbox)
+
+    def process_pending(self) -> int:
+        """
+        Process calls queued by other threads before the call in one transaction; returns how many there were. Calls
+        queued meanwhile are left for the next one, so waves are not postponed indefinitely under sustained load.
+        """
+        self._wakeup.clear()
+        inbox = self._inbox
+        processed = len(inbox)
+        with self.transaction():
+            for _ in range(processed):
+                func, args = inbox.popleft()
+                func(*args)
+        return processed
+
+    def serve(self, stop: threading.Event, poll_interval: float = 0.1):
+        """Bind the graph to the current thread and process queued calls until `stop` is set."""
+        self.bind_thread()
+        while not stop.is_set():
+            if self._wakeup.wait(poll_interval):
+                self.process_pending()
+        while self._inbox:
+            self.process_pending()
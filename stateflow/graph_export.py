@@ -0,0 +1,173 @@
+"""
+Exporting the notifier graph to DOT, JSON or GraphML files.
+
+The graph is walked iteratively and written directly to the file, so it works for graphs with many thousands of
+notifiers.
+"""
+
+import json
+from typing import IO, Dict, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape, quoteattr
+
+from stateflow.common import is_observable
+from stateflow.notifier import INotifier, Notifier, walk_notifiers
+
+FORMATS = ('dot', 'json', 'graphml')
+
+
+NODE_KEYS = [('name', str), ('priority', int), ('active', bool)]
+STATS_KEYS = [('calls', int), ('called_when_inactive', bool), ('observers', int), ('observed', int),
+              ('exception', str)]
+
+
+def _node_attributes(n: INotifier, stats: bool) -> dict:
+    attributes = {'name': n.name, 'priority': n.priority, 'active': n.active}
+    if stats and not isinstance(n, Notifier):
+        attributes.update(calls=0, called_when_inactive=False, observers=0, observed=0, exception='')
+    elif stats:
+        attributes['calls'] = n.calls
+        attributes['called_when_inactive'] = n._called_when_inactive
+        attributes['observers'] = len(n._observers)
+        attributes['observed'] = len(n._observed)
+        exception = n.stats.get('exception')
+        attributes['exception'] = repr(exception) if exception is not None else ''
+    return attributes
+
+
+def _dot_string(s) -> str:
+    return '"' + str(s).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+class _DotWriter:
+    def __init__(self, f: IO[str]):
+        self.f = f
+
+    def begin(self, keys: List[Tuple[str, type]]):
+        self.f.write('digraph notifiers {\n')
+
+    def node(self, index: int, attributes: dict):
+        extra = ''.join(', {}={}'.format(key, _dot_string(value)) for key, value in attributes.items()
+                        if key not in ('name', 'active'))
+        self.f.write('  n{} [label={}, shape=box, style={}{}];\n'.format(
+            index, _dot_string(attributes['name']), 'solid' if attributes['active'] else 'dashed', extra))
+
+    def begin_edges(self):
+        pass
+
+    def edge(self, source: int, target: int):
+        self.f.write('  n{} -> n{};\n'.format(source, target))
+
+    def end(self):
+        self.f.write('}\n')
+
+
+class _JsonWriter:
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self.count = 0
+
+    def begin(self, keys: List[Tuple[str, type]]):
+        self.f.write('{"nodes": [')
+
+    def _item(self, item: dict):
+        self.f.write(',\n' if self.count else '\n')
+        self.f.write(json.dumps(item))
+        self.count += 1
+
+    def node(self, index: int, attributes: dict):
+        self._item(dict(id=index, **attributes))
+
+    def begin_edges(self):
+        self.f.write('\n], "edges": [')
+        self.count = 0
+
+    def edge(self, source: int, target: int):
+        self._item({'source': source, 'target': target})
+
+    def end(self):
+        self.f.write('\n]}\n')
+
+
+_GRAPHML_TYPES = {bool: 'boolean', int: 'int', str: 'string'}
+
+
+class _GraphMLWriter:
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self.edges = 0
+
+    def begin(self, keys: List[Tuple[str, type]]):
+        self.f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                     '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        for key, value_type in keys:
+            self.f.write('  <key id={0} for="node" attr.name={0} attr.type="{1}"/>\n'.format(
+                quoteattr(key), _GRAPHML_TYPES[value_type]))
+        self.f.write('  <graph id="notifiers" edgedefault="directed">\n')
+
+    def node(self, index: int, attributes: dict):
+        self.f.write('    <node id="n{}">'.format(index))
+        for key, value in attributes.items():
+            text = str(value).lower() if isinstance(value, bool) else escape(str(value))
+            self.f.write('<data key={}>{}</data>'.format(quoteattr(key), text))
+        self.f.write('</node>\n')
+
+    def begin_edges(self):
+        pass
+
+    def edge(self, source: int, target: int):
+        self.f.write('    <edge id="e{}" source="n{}" target="n{}"/>\n'.format(self.edges, source, target))
+        self.edges += 1
+
+    def end(self):
+        self.f.write('  </graph>\n</graphml>\n')
+
+
+_WRITERS = {'dot': _DotWriter, 'json': _JsonWriter, 'graphml': _GraphMLWriter}
+
+
+def export_graph(start, path_or_file: Union[str, IO[str]], format: str = 'dot', active_only: bool = False,
+                 max_depth: Optional[int] = None, stats: bool = False):
+    """
+    Write the graph of notifiers connected (directly or indirectly) with `start` to a file.
+
+    Arguments:
+        start: A notifier or an observable (its notifier is used).
+        path_or_file: A file name or a text file object.
+        format: One of 'dot', 'json' or 'graphml'.
+        active_only: Skip inactive notifiers (except `start`).
+        max_depth: Export only notifiers at most `max_depth` edges away from `start`.
+        stats: Add call statistics to nodes.
+
+    Edges go from an observer to the observed notifier.
+    """
+    if format not in _WRITERS:
+        raise ValueError("format should be one of {} (got {!r})".format(FORMATS, format))
+    if is_observable(start):
+        start = start.__notifier__()
+
+    indices = {}  # type: Dict[INotifier, int]
+    predicate = (lambda n: n.active) if active_only else None
+    for n, _ in walk_notifiers(start, max_depth=max_depth, predicate=predicate):
+        indices[n] = len(indices)
+
+    keys = NODE_KEYS + STATS_KEYS if stats else NODE_KEYS
+
+    if isinstance(path_or_file, str):
+        with open(path_or_file, 'w') as f:
+            _write(_WRITERS[format](f), indices, keys, stats)
+    else:
+        _write(_WRITERS[format](path_or_file), indices, keys, stats)
+
+
+def _write(writer, indices: Dict[INotifier, int], keys: List[Tuple[str, type]], stats: bool):
+    writer.begin(keys)
+    for n, index in indices.items():
+        writer.node(index, _node_attributes(n, stats))
+    writer.begin_edges()
+    for n, index in indices.items():
+        if isinstance(n, Notifier):
+            for observer in n._observers:
+                observer_index = indices.get(observer)
+                if observer_index is not None:
+                    writer.edge(observer_index, index)
+    writer.end()
@@ -0,0 +1,106 @@
+"""
+Statistics of the notifier graph, e.g. for periodic monitoring of its size and shape.
+"""
+
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from stateflow.cache_manager import value_size
+from stateflow.common import is_observable
+from stateflow.function import ReactiveFunction
+from stateflow.graph import Graph
+from stateflow.notifier import Notifier, walk_notifiers
+from stateflow.var import Cache
+
+PERCENTILES = (50, 90, 99, 100)
+
+
+def node_type(notifier: Notifier) -> str:
+    """The name of the type of the node owning `notifier` (e.g. 'Var', 'Cache' or 'CallResult')."""
+    owner = notifier.owner
+    if owner is None:
+        return 'Notifier'
+    if isinstance(owner, ReactiveFunction):
+        return 'CallResult'  # calls are owned by their reactive function (see `NotifierRegistry.by_owner`)
+    return type(owner).__name__
+
+
+def estimate_size(notifier: Notifier) -> int:
+    """
+    Estimate the memory (in bytes) used by `notifier` and its owner, including the value of a cache. Values of `Var`s
+    are not included (they are referenced by the caller).
+    """
+    size = sys.getsizeof(notifier) + sys.getsizeof(notifier.__dict__)
+    for weak_set in (notifier._observers, notifier._active_observers, notifier._observed):
+        size += sys.getsizeof(weak_set) + sys.getsizeof(weak_set.data)
+    owner = notifier.owner
+    if owner is not None and not isinstance(owner, ReactiveFunction):  # a reactive function is shared by its calls
+        size += sys.getsizeof(owner) + sys.getsizeof(getattr(owner, '__dict__', {}))
+        if isinstance(owner, Cache) and owner._cache_is_valid:
+            size += value_size(owner._cached_value)
+    return size
+
+
+def percentiles(values: Sequence[int], ranks: Sequence[int] = PERCENTILES) -> Dict[str, int]:
+    """Nearest-rank percentiles of `values` (zeros if there are no values)."""
+    ordered = sorted(values)
+    if not ordered:
+        return {'p{}'.format(rank): 0 for rank in ranks}
+    return {'p{}'.format(rank): ordered[max(0, -(-rank * len(ordered) // 100) - 1)] for rank in ranks}
+
+
+def graph_stats(root_or_partition, max_depth: Optional[int] = None) -> dict:
+    """
+    Return statistics of the graph connected with `root_or_partition` (a notifier or an observable), or of notifiers
+    bound to a `Graph` partition:
+
+        nodes, edges: Counts (edges between the included nodes).
+        priority_histogram: Number of nodes with each priority (the depth in the graph).
+        fan_in, fan_out: Percentiles of the numbers of observed notifiers and observers.
+        active, active_fraction: Active nodes.
+        pending: Inactive nodes that were notified (they are called when activated).
+        queue_length: Calls queued in the refresher of the root (or the partition).
+        types: For each type of nodes (e.g. 'Var', 'Cache', 'CallResult'), their number and estimated bytes.
+        bytes: The estimated total.
+    """
+    if isinstance(root_or_partition, Graph):
+        nodes = root_or_partition.notifiers()  # type: List[Notifier]
+        refresher = root_or_partition.refresher
+    else:
+        root = root_or_partition.__notifier__() if is_observable(root_or_partition) else root_or_partition
+        nodes = [n for n, _ in walk_notifiers(root, max_depth=max_depth) if isinstance(n, Notifier)]
+        refresher = root.refresher if isinstance(root, Notifier) else None
+
+    included = set(nodes)
+    edges = 0
+    active = 0
+    pending = 0
+    histogram = {}  # type: Dict[int, int]
+    fan_in = []
+    fan_out = []
+    types = {}  # type: Dict[str, Dict[str, int]]
+    for n in nodes:
+        observers = list(n._observers)
+        edges += sum(1 for observer in observers if observer in included)
+        fan_out.append(len(observers))
+        fan_in.append(len(n._observed))
+        active += n._is_active
+        pending += n._called_when_inactive
+        histogram[n.priority] = histogram.get(n.priority, 0) + 1
+        type_stats = types.setdefault(node_type(n), {'count': 0, 'bytes': 0})
+        type_stats['count'] += 1
+        type_stats['bytes'] += estimate_size(n)
+
+    return {
+        'nodes': len(nodes),
+        'edges': edges,
+        'priority_histogram': dict(sorted(histogram.items())),
+        'fan_in': percentiles(fan_in),
+        'fan_out': percentiles(fan_out),
+        'active': active,
+        'active_fraction': active / len(nodes) if nodes else 0.0,
+        'pending': pending,
+        'queue_length': refresher.queue.qsize() if refresher is not None else 0,
+        'types': types,
+        'bytes': sum(type_stats['bytes'] for type_stats in types.values()),
+    }
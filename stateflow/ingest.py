@@ -0,0 +1,107 @@
+"""
+Feeding a `Var` from an asynchronous stream (`async for`) without flooding the refresher.
+"""
+
+import asyncio
+from collections import deque
+from typing import AsyncIterable
+
+from stateflow.common import Observable, T, assign
+
+BLOCK = 'block'  # stop pulling from the source until there is place in the buffer
+DROP = 'drop'  # drop the oldest buffered item
+CONFLATE = 'conflate'  # replace the newest buffered item
+
+POLICIES = (BLOCK, DROP, CONFLATE)
+
+
+class Ingestion:
+    """
+    Pulls items from an async iterable and assigns them to `var` one by one, waiting for the refresher to finish the
+    wave started by each assignment before the next one. With a synchronous refresher (the default) the wave runs
+    inside `assign`; with an asynchronous one (e.g. of a `Graph`) its task is awaited.
+
+    Items that are pulled but not assigned yet are kept in a buffer of at most `maxsize` items. When the buffer is full,
+    `policy` decides what happens: `BLOCK` stops pulling from the source, `DROP` discards the oldest buffered item and
+    `CONFLATE` replaces the newest one.
+    """
+
+    def __init__(self, source: AsyncIterable[T], var: Observable[T], maxsize: int = 1, policy: str = BLOCK):
+        if policy not in POLICIES:
+            raise ValueError("policy should be one of {} (got {!r})".format(POLICIES, policy))
+        if maxsize < 1:
+            raise ValueError("maxsize should be at least 1 (got {})".format(maxsize))
+        self.source = source
+        self.var = var
+        self.maxsize = maxsize
+        self.policy = policy
+        self.received = 0
+        self.assigned = 0
+        self.dropped = 0
+        self.conflated = 0
+        self._buffer = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._exhausted = False
+
+    async def run(self):
+        """Run until the source is exhausted and all buffered items are assigned."""
+        reader = asyncio.ensure_future(self._read())
+        try:
+            await self._write()
+            await reader  # propagate an exception raised by the source
+        finally:
+            reader.cancel()
+
+    async def _read(self):
+        try:
+            async for item in self.source:
+                self.received += 1
+                if len(self._buffer) >= self.maxsize:
+                    if self.policy == BLOCK:
+                        while len(self._buffer) >= self.maxsize:
+                            self._not_full.clear()
+                            await self._not_full.wait()
+                    elif self.policy == DROP:
+                        self._buffer.popleft()
+                        self.dropped += 1
+                    else:
+                        self._buffer.pop()
+                        self.conflated += 1
+                self._buffer.append(item)
+                self._not_empty.set()
+        finally:
+            self._exhausted = True
+            self._not_empty.set()
+
+    async def _write(self):
+        while True:
+            if not self._buffer:
+                if self._exhausted:
+                    return
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+            item = self._buffer.popleft()
+            self._not_full.set()
+            assign(self.var, item)
+            self.assigned += 1
+            await self._wave_finished()
+            await asyncio.sleep(0)  # let the source and other tasks run
+
+    async def _wave_finished(self):
+        refresher = getattr(self.var.__notifier__(), 'refresher', None)
+        task = getattr(refresher, 'task', None)  # only asynchronous refreshers run waves in tasks
+        while task is not None and not task.done():
+            await asyncio.wait([task])  # not `await task`: cancelling the ingestion shouldn't cancel the refresher
+            task = refresher.task
+
+
+async def ingest(source: AsyncIterable[T], var: Observable[T], maxsize: int = 1, policy: str = BLOCK) -> Ingestion:
+    """
+    Assign items from `source` to `var` until the source is exhausted. Returns the `Ingestion` with counters of
+    received, assigned, dropped and conflated items. See `Ingestion` for the meaning of the arguments.
+    """
+    ingestion = Ingestion(source, var, maxsize, policy)
+    await ingestion.run()
+    return ingestion
@@ -10,4 +10,13 @@ def bind_arguments(signature, args: Sequence[Any], kwargs: Mapping[str, Any]) ->
         bound_args.apply_defaults()
         return bound_args.args, bound_args.kwargs
     else:
-        return args, kwargs
\ No newline at end of file
+        return args, kwargs
+
+
+def optional_numpy():
+    """Return the `numpy` module, or None if it's not installed (it's imported on the first use)."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
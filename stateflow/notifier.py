@@ -1,17 +1,24 @@
 import abc
-import logging
 import weakref
-from _weakrefset import WeakSet
-from typing import Set
+from collections import deque
+from contextlib import ExitStack
+from itertools import chain, count
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from stateflow.common import NotifyFunc
-from stateflow.sync_refresher import get_default_refresher
+from stateflow.graph import active_graphs
+from stateflow.scope import active_scopes
+from stateflow.sync_refresher import SyncRefresher, UpdateTransaction, get_default_refresher
+from stateflow.tracing import active_subscribers
 
-logger = logging.getLogger('notify')
 
-all_notifiers = WeakSet()
+_registry = None  # type: Optional[NotifierRegistry]
 
-_got_finals = 0
+_clock = count(1)  # a logical clock for ordering changes of notifiers and their deactivations
+
+
+def _tick() -> int:
+    return next(_clock)  # atomic (unlike `+=` on a global), so notifiers in different threads never get the same time
 
 
 def is_hashable(v):
@@ -110,11 +117,13 @@ class DummyNotifier(INotifier):
 class Notifier(INotifier):
 
 
-    def __init__(self, notify_func: NotifyFunc = lambda: True, forced_active=False, name=""):
+    def __init__(self, notify_func: NotifyFunc = lambda: True, forced_active=False, name="", owner=None):
         """
         Arguments:
             notify_func: A function that will be called when one of the observed notifiers is changed.
             forced_active: If True, this notifier is always active, even if there are no active observers.
+            owner: The node that created this notifier (e.g. a `Var`), or the `ReactiveFunction` for notifiers of its
+                   calls; it's referenced weakly (see `owner`).
         """
         self._observers: Set[Notifier] = weakref.WeakSet()
         self._active_observers: Set[Notifier] = weakref.WeakSet()
@@ -126,6 +135,11 @@ class Notifier(INotifier):
         self._is_active = forced_active  # notifier is active iif at least one of its observers is active or _forced_active
 
         self._called_when_inactive = False
+        # inactive observers are not notified; instead, when activated, they compare these to find what they missed
+        self._changed_at = 0  # when the notifier last notified its observers
+        self._inactive_since = _tick()
+
+        self._owner = weakref.ref(owner) if owner is not None else None
 
         self.name = name
         assert is_notify_func(notify_func)
@@ -133,24 +147,52 @@ class Notifier(INotifier):
         self.calls = 0
         self.stats = dict()
         self.frame = None
-        all_notifiers.add(self)
+        self.graph = active_graphs[-1] if active_graphs else None  # None means the default refresher
+        if self.graph is not None:
+            self.graph.own_notifier(self)
+        if _registry is not None:
+            _registry.add(self)
+        if active_scopes:
+            active_scopes[-1].own_notifier(self)
+
+    @property
+    def owner(self):
+        """The owner given when the notifier was created (or None, also if it doesn't exist anymore)."""
+        return self._owner() if self._owner is not None else None
 
     def notify(self):
-        logger.debug(f"Notifier notified: {self}")
-        get_default_refresher().schedule_call(self)
+        if not self._is_active:
+            self._called_when_inactive = True  # no need to queue it, it's called when activated
+            if active_subscribers:
+                for subscriber in active_subscribers:
+                    subscriber.on_skip(self)
+            return
+        if self.graph is not None:
+            self.graph.schedule_call(self)
+        else:
+            get_default_refresher().schedule_call(self)
+
+    @property
+    def refresher(self):
+        """The refresher that calls this notifier."""
+        return self.graph.refresher if self.graph is not None else get_default_refresher()
 
     def call(self):
-        logger.debug(f"Notifier called: {self}")
         self.calls += 1
         if self.active:
             possibly_changed = self.notify_func()
             if possibly_changed:
+                self._changed_at = _tick()
                 self._notify_observers()
         else:
             self._called_when_inactive = True
+            if active_subscribers:
+                for subscriber in active_subscribers:
+                    subscriber.on_skip(self)
 
     def _notify_observers(self):
-        for observer in self._observers:  # fixme: shouldn't we use _active_observers here?
+        # inactive observers catch up when activated (see `_propagate_active`)
+        for observer in list(self._active_observers):
             observer.notify()
 
     def add_observer(self, observer: 'Notifier'):
@@ -187,17 +229,7 @@ class Notifier(INotifier):
         My active state might have changed, so I may need to readd myself to observed notifiers (or they wouldn't know
         someone active is observing them)
         """
-        new_is_active = (len(self._active_observers) > 0 or self._forced_active)
-        if new_is_active != self._is_active:
-            self._is_active = new_is_active
-            for observed in self._observed:
-                if self._is_active:
-                    observed._add_to_active(self)
-                else:
-                    observed._remove_from_active(self)
-            if self._is_active and self._called_when_inactive:
-                self._called_when_inactive = False
-                self.notify()
+        _propagate_active(self)
 
     @property
     def priority(self):
@@ -219,6 +251,120 @@ class Notifier(INotifier):
 
 
 
+def _propagate_active(start: Notifier):
+    """
+    Update the active state of `start` and (transitively) of notifiers it observes, in one pass without recursion.
+
+    A notifier is active iff its set of active observers is not empty (it works as a reference count) or it's forced to
+    be active. Adding or removing one observer can only activate or only deactivate notifiers, so each of them changes
+    its state at most once and the pass is O(V+E) of the affected subgraph.
+
+    Notifiers that were notified while inactive, or observe a notifier that has changed since they were deactivated,
+    are notified after the pass, in one transaction (so they are called once, in the priority order, with the whole
+    subgraph already active).
+    """
+    woken = []
+    stack = [start]
+    while stack:
+        n = stack.pop()
+        is_active = len(n._active_observers) > 0 or n._forced_active
+        if is_active == n._is_active:
+            continue
+        n._is_active = is_active
+        missed_change = False
+        for observed in n._observed:
+            if is_active:
+                observed._active_observers.add(n)
+                missed_change = missed_change or observed._changed_at > n._inactive_since
+            else:
+                observed._active_observers.discard(n)
+            stack.append(observed)
+        if not is_active:
+            n._inactive_since = _tick()
+        elif n._called_when_inactive or missed_change:
+            n._called_when_inactive = False
+            woken.append(n)
+    if len(woken) == 1:
+        woken[0].notify()
+    elif woken:
+        with ExitStack() as transactions:
+            refreshers = {id(n.refresher): n.refresher for n in woken}
+            for refresher in refreshers.values():
+                if isinstance(refresher, SyncRefresher):
+                    transactions.enter_context(UpdateTransaction(refresher))
+            for n in woken:
+                n.notify()
+
+
+class NotifierRegistry:
+    """
+    An index of living notifiers, meant for debugging and introspection tools. Notifiers are registered only while
+    the registry is enabled (see `enable_registry`), so there is no cost when it's disabled.
+
+    Names and activeness of notifiers may change after they are created, so they are looked up when queried.
+    """
+
+    def __init__(self):
+        self._notifiers = weakref.WeakSet()  # type: Set[Notifier]
+
+    def add(self, notifier: 'Notifier'):
+        self._notifiers.add(notifier)
+
+    def __iter__(self) -> Iterator['Notifier']:
+        return iter(list(self._notifiers))
+
+    def __len__(self) -> int:
+        return len(self._notifiers)
+
+    def __contains__(self, notifier) -> bool:
+        return notifier in self._notifiers
+
+    def owner(self, notifier: 'Notifier'):
+        """Return the owner given when the notifier was created (or None)."""
+        return notifier.owner
+
+    def by_name(self, name: str) -> List['Notifier']:
+        return [n for n in self if n.name == name]
+
+    def by_owner(self, owner) -> List['Notifier']:
+        """E.g. notifiers of all calls of a `ReactiveFunction`."""
+        return [n for n in self if n.owner is owner]
+
+    def active(self) -> List['Notifier']:
+        return [n for n in self if n.active]
+
+    def inactive(self) -> List['Notifier']:
+        return [n for n in self if not n.active]
+
+    def index_by_name(self) -> Dict[str, List['Notifier']]:
+        index = {}
+        for n in self:
+            index.setdefault(n.name, []).append(n)
+        return index
+
+
+def enable_registry() -> NotifierRegistry:
+    """
+    Start registering newly created notifiers in a `NotifierRegistry` and return it. Notifiers created earlier are not
+    included. If the registry is already enabled, the existing one is returned.
+    """
+    global _registry
+    if _registry is None:
+        _registry = NotifierRegistry()
+    return _registry
+
+
+def disable_registry():
+    """Stop registering notifiers and drop the registry."""
+    global _registry
+    _registry = None
+
+
+def get_registry() -> Optional[NotifierRegistry]:
+    """Return the registry if it's enabled or None otherwise."""
+    return _registry
+
+
 ACTIVE_NOTIFIER = Notifier(forced_active=True, name="ACTIVE")
 
 
@@ -231,40 +377,53 @@ def refresh_notifiers(*notifiers: Notifier):
     inactive_notifiers = [notifier for notifier in notifiers if not notifier.active]
     for notifier in inactive_notifiers:
         notifier.add_observer(ACTIVE_NOTIFIER)
+    for notifier in notifiers:
+        _call_pending_up_to(notifier)
     for notifier in inactive_notifiers:
         notifier.remove_observer(ACTIVE_NOTIFIER)
 
-def dump_notifiers_to_dot(notifier: INotifier, filename: str = 'notifiers.dot'):
+
+def _call_pending_up_to(notifier: Notifier):
     """
-    Dumps the notifier graph to a dot file.
+    Calls scheduled while a refresher is running are left to the running loop (unless they precede the current one).
+    Run them now if the notifier could depend on them.
     """
-    import pydot
+    refresher = notifier.refresher
+    if isinstance(refresher, SyncRefresher) and refresher.running and not refresher.queue.empty() \
+            and refresher.queue.peek().priority <= notifier.priority:
+        refresher.force_run(max_priority=notifier.priority)
+
 
-    graph = pydot.Dot(graph_type='digraph')
+def walk_notifiers(start: INotifier, max_depth: Optional[int] = None,
+                   predicate: Optional[Callable[[INotifier], bool]] = None) -> Iterator[Tuple[INotifier, int]]:
+    """
+    Iterate (breadth-first, without recursion) over notifiers connected with `start` (as observers or observed),
+    yielding each notifier once together with its distance from `start`. Notifiers farther than `max_depth` or not
+    satisfying `predicate` are not visited (and the walk doesn't go through them).
 
-    def add_node(n: INotifier):
-        node = pydot.Node(str(id(n)), label=n.name, shape='box', style="dashed" if not n.active else "solid")
-        graph.add_node(node)
-        return node
+    `ACTIVE_NOTIFIER` is yielded, but the walk doesn't go through it (unless it's `start`): it observes every volatile
+    node in the process, so unrelated subgraphs would be connected through it.
+    """
+    seen = {start}
+    queue = deque([(start, 0)])
+    while queue:
+        n, depth = queue.popleft()
+        yield n, depth
+        if not isinstance(n, Notifier) or (max_depth is not None and depth >= max_depth) \
+                or (n is ACTIVE_NOTIFIER and depth > 0):
+            continue
+        for another_n in chain(list(n._observers), list(n._observed)):
+            if another_n not in seen and (predicate is None or predicate(another_n)):
+                seen.add(another_n)
+                queue.append((another_n, depth + 1))
 
-    def add_edge(from_node, to_node):
-        edge = pydot.Edge(from_node, to_node)
-        graph.add_edge(edge)
 
-    nodes = {}
-    def traverse(n: INotifier):
-        if n in nodes:
-            return
-        nodes[n] = add_node(n)
-        if isinstance(n, Notifier):
-            for another_n in n._observers:
-                traverse(another_n)
-                add_edge(nodes[another_n], nodes[n])
-            for another_n in list(n._observers) + list(n._observed):
-                traverse(another_n)
-
-    traverse(notifier)
-    graph.write(filename, format='dot')
+def dump_notifiers_to_dot(notifier: INotifier, filename: str = 'notifiers.dot'):
+    """
+    Dumps the notifier graph to a dot file.
+    """
+    from stateflow.graph_export import export_graph
+    export_graph(notifier, filename, format='dot')
 # class ActiveNotifier:
 #     def __init__(self, notifier: Notifier):
 #         self._notifier = notifier
@@ -0,0 +1,133 @@
+"""
+Observables that limit the rate of notifications coming from a high-frequency source.
+"""
+
+import asyncio
+from typing import Optional
+
+from stateflow.common import Observable, T
+from stateflow.forwarders import ConstForwarders
+from stateflow.notifier import Notifier
+from stateflow.var import Proxy
+
+
+class RateLimitedProxy(Proxy[T], ConstForwarders):
+    """
+    A `Proxy` that doesn't forward notifications of the inner `Observable` immediately, but emits them later using
+    the asyncio event loop. The value is always read from the inner `Observable`, so the latest value is delivered
+    with the last emitted notification.
+
+    Counters:
+        received: notifications received from the inner `Observable`,
+        emitted: notifications forwarded to dependents,
+        dropped: notifications merged into another (pending or already emitted) one.
+    """
+
+    def __init__(self, inner: Observable[T], interval_ms: float, loop: Optional[asyncio.AbstractEventLoop] = None):
+        super().__init__(inner)
+        self.interval = interval_ms / 1000
+        self.received = 0
+        self.emitted = 0
+        self.dropped = 0
+        self._loop = loop
+        self._timer = None  # type: asyncio.TimerHandle
+        self._last_emit = float('-inf')
+        self._notifier = Notifier(name=f'{type(self).__name__}({interval_ms}ms)', owner=self)
+        # `_trigger` is called by the refresher when the inner observable changes; it never propagates the
+        # notification by itself, but `_notifier` observes it so the activeness is passed down to the inner observable
+        self._trigger = Notifier(self._on_inner_changed, name=f'{type(self).__name__} trigger',
+                                 owner=self)
+        self._inner.__notifier__().add_observer(self._trigger)
+        self._trigger.add_observer(self._notifier)
+
+    def __notifier__(self) -> Notifier:
+        return self._notifier
+
+    @property
+    def pending(self) -> bool:
+        """Whether there is a notification waiting to be emitted."""
+        return self._timer is not None
+
+    def _get_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        if self._loop is not None:
+            return self._loop
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _on_inner_changed(self):
+        self.received += 1
+        loop = self._get_loop()
+        if loop is None:
+            # there is no loop that could deliver the notification later, so don't lose it
+            self._emit()
+        else:
+            self._schedule(loop)
+        return False
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop):
+        raise NotImplementedError()
+
+    def _fire(self):
+        self._timer = None
+        self._emit()
+
+    def _emit(self):
+        self.emitted += 1
+        loop = self._get_loop()
+        self._last_emit = loop.time() if loop is not None else float('-inf')
+        self._notifier.notify()
+
+    def cancel(self):
+        """Drop the pending notification (if any)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self.dropped += 1
+
+
+class DebouncedProxy(RateLimitedProxy[T]):
+    """
+    Emits a notification once the inner `Observable` has not changed for `interval_ms`.
+    """
+    repr_name = 'Debounced'
+
+    def _schedule(self, loop):
+        if self._timer is not None:
+            self._timer.cancel()
+            self.dropped += 1
+        self._timer = loop.call_later(self.interval, self._fire)
+
+
+class ThrottledProxy(RateLimitedProxy[T]):
+    """
+    Emits at most one notification per `interval_ms`. The first change is emitted immediately, the changes that come
+    later within the interval are merged into one notification emitted at the end of it.
+    """
+    repr_name = 'Throttled'
+
+    def _schedule(self, loop):
+        if self._timer is not None:
+            self.dropped += 1
+            return
+        delay = self._last_emit + self.interval - loop.time()
+        if delay <= 0:
+            self._emit()
+        else:
+            self._timer = loop.call_later(delay, self._fire)
+
+
+def debounce(var: Observable[T], ms: float, loop: Optional[asyncio.AbstractEventLoop] = None) -> DebouncedProxy[T]:
+    """
+    Return an observable with the value of `var` that notifies its dependents only after `var` stops changing for
+    `ms` milliseconds.
+    """
+    return DebouncedProxy(var, ms, loop)
+
+
+def throttle(var: Observable[T], ms: float, loop: Optional[asyncio.AbstractEventLoop] = None) -> ThrottledProxy[T]:
+    """
+    Return an observable with the value of `var` that notifies its dependents at most once per `ms` milliseconds.
+    """
+    return ThrottledProxy(var, ms, loop)
@@ -0,0 +1,183 @@
+"""
+Recording assignments to vars into a log and replaying them, e.g. for reproducing a slow production workload offline.
+
+The log is an append-only binary file: `MAGIC` followed by records. A record is `_RECORD` (kind, node id, timestamp,
+length of the payload) and the payload. A `NAME` record binds a node id to the (stable) name of a var, before its
+first `ASSIGN` record; the payload of an `ASSIGN` record is the encoded value (pickled by default). Node ids are
+assigned by each recording session, so logs of several sessions can be appended to one file.
+"""
+
+import logging
+import pickle
+import struct
+import time
+from typing import BinaryIO, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from stateflow.common import assign
+from stateflow.graph_stats import percentiles
+from stateflow.tracing import Subscriber, subscribe, unsubscribe
+from stateflow.var import Var
+
+logger = logging.getLogger('replay')
+
+MAGIC = b'SFLOG\x02'
+_RECORD = struct.Struct('<BIdI')  # kind, node id, timestamp, length of the payload
+
+NAME = 0
+ASSIGN = 1
+
+
+def _open(file: Union[str, BinaryIO], mode: str) -> Tuple[BinaryIO, bool]:
+    if isinstance(file, str):
+        return open(file, mode), True
+    return file, False
+
+
+class Recorder(Subscriber):
+    """
+    Appends assignments to `vars` (a mapping from stable names to vars) to the log `file` (a path or a binary file)
+    while it's entered (`with Recorder(...):`). Assignments to other vars are not recorded.
+
+    Arguments:
+        encode: Turns a value into bytes. It may store a reference instead of the value (e.g. a key of a blob store);
+                the replayer should be given the matching `decode`. Values that can't be encoded are counted in
+                `skipped`.
+
+    Recording never breaks an assignment: errors of writing the log are logged and counted in `errors`.
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], vars: Mapping[str, Var], encode: Callable[[object], bytes] = None):
+        self.file = file
+        self.names = {id(var): name for name, var in vars.items()}
+        self.encode = encode or (lambda value: pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self.records = 0
+        self.skipped = 0
+        self.errors = 0
+        self._vars = list(vars.values())  # the ids in `names` have to stay valid
+        self._node_ids = {}  # type: Dict[str, int]
+        self._out = None  # type: Optional[BinaryIO]
+        self._close_out = False
+
+    def __enter__(self) -> 'Recorder':
+        self._out, self._close_out = _open(self.file, 'ab')
+        if self._out.tell() == 0:
+            self._out.write(MAGIC)
+        self._node_ids.clear()
+        subscribe(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        unsubscribe(self)
+        self._out.flush()
+        if self._close_out:
+            self._out.close()
+        self._out = None
+
+    def on_assign(self, var, value):
+        name = self.names.get(id(var))
+        if name is None:
+            return
+        timestamp = time.time()
+        try:
+            payload = self.encode(value)
+        except Exception as e:
+            self.skipped += 1
+            logger.debug('value of %s not recorded: %r', name, e)
+            return
+        try:
+            node_id = self._node_ids.get(name)
+            if node_id is None:
+                self._write(NAME, len(self._node_ids), timestamp, name.encode())
+                node_id = self._node_ids[name] = len(self._node_ids)
+            self._write(ASSIGN, node_id, timestamp, payload)
+        except Exception:
+            self.errors += 1
+            logger.exception('assignment to %s not recorded', name)
+            return
+        self.records += 1
+
+    def _write(self, kind: int, node_id: int, timestamp: float, payload: bytes):
+        self._out.write(_RECORD.pack(kind, node_id, timestamp, len(payload)))
+        self._out.write(payload)
+
+
+def read_log(file: Union[str, BinaryIO], decode: Callable[[bytes], object] = pickle.loads) \
+        -> Iterator[Tuple[float, str, object]]:
+    """Iterate over `(timestamp, name, value)` of assignments recorded in `file`."""
+    f, close = _open(file, 'rb')
+    try:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("not an assignment log")
+        names = {}  # type: Dict[int, str]
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                if header:
+                    logger.warning('truncated record at the end of the log')
+                return
+            kind, node_id, timestamp, length = _RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                logger.warning('truncated record at the end of the log')
+                return
+            if kind == NAME:
+                names[node_id] = payload.decode()
+            elif kind == ASSIGN:
+                yield timestamp, names[node_id], decode(payload)
+            else:
+                raise ValueError("unknown record kind {}".format(kind))
+    finally:
+        if close:
+            f.close()
+
+
+class ReplayReport:
+    """Latencies (in seconds) of waves caused by replayed assignments, in the order of the log."""
+
+    def __init__(self):
+        self.latencies = []  # type: List[float]
+        self.missing = {}  # type: Dict[str, int]  # numbers of assignments to names without a var
+        self.duration = 0.0
+
+    def stats(self) -> dict:
+        stats = {'waves': len(self.latencies), 'total': sum(self.latencies), 'duration': self.duration,
+                 'missing': sum(self.missing.values())}
+        stats.update(percentiles(self.latencies))
+        return stats
+
+
+class Replayer:
+    """
+    Feeds assignments from a log to vars of a (freshly built) graph. Each assignment is made separately and the time
+    of `assign` is reported as the latency of its wave, so it's meaningful with the synchronous refresher (the default).
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], decode: Callable[[bytes], object] = pickle.loads):
+        self.file = file
+        self.decode = decode
+
+    def replay(self, vars: Mapping[str, Var], speed: Optional[float] = None) -> ReplayReport:
+        """
+        Assign the recorded values to `vars` (a mapping from names used while recording). With `speed`, assignments
+        are made at the recorded pace (scaled by `speed`, e.g. 2.0 is twice as fast); otherwise as fast as possible.
+        """
+        report = ReplayReport()
+        clock = time.perf_counter
+        started = clock()
+        first_timestamp = None
+        for timestamp, name, value in read_log(self.file, self.decode):
+            var = vars.get(name)
+            if var is None:
+                report.missing[name] = report.missing.get(name, 0) + 1
+                continue
+            if speed is not None:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                delay = started + (timestamp - first_timestamp) / speed - clock()
+                if delay > 0:
+                    time.sleep(delay)
+            wave_started = clock()
+            assign(var, value)
+            report.latencies.append(clock() - wave_started)
+        report.duration = clock() - started
+        return report
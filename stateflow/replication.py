@@ -0,0 +1,262 @@
+"""
+Mirroring values of selected observables to a peer process over a stream socket (e.g. a Unix socket).
+
+Changes are collected during a refresh wave and sent as one frame after the wave. A frame is a header (`_FRAME`:
+length of the records, wave number, number of records) followed by records: `_RECORD` (kind, length of the name), the
+name and a kind-specific payload. NumPy arrays are sent compressed with zlib; when the previous value sent had the same
+shape and dtype, only the XOR with it is compressed (small changes of a large array compress very well). Other values
+are pickled; a `Replica` unpickles only plain data by default (see `restricted_loads`), but the socket should still
+connect trusted processes only.
+"""
+
+import io
+import logging
+import pickle
+import queue
+import struct
+import threading
+import zlib
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from stateflow.common import Observable, ev
+from stateflow.errors import EvError, FinalizedError, NotInitializedError
+from stateflow.internal_utils import optional_numpy
+from stateflow.sync_refresher import UpdateTransaction
+from stateflow.var import Var
+from stateflow.wave_collector import WaveCollector
+
+logger = logging.getLogger('replication')
+
+_FRAME = struct.Struct('<IQI')  # length of the records, wave, number of records
+_RECORD = struct.Struct('<BH')  # kind, length of the name
+_LENGTH = struct.Struct('<I')
+_ARRAY = struct.Struct('<BB')  # length of the dtype, number of dimensions
+
+PICKLE = 0
+ARRAY = 1
+ARRAY_DELTA = 2
+
+
+# globals that plain data may refer to when pickled; anything else could run arbitrary code while unpickled
+SAFE_GLOBALS = frozenset([('builtins', 'complex'), ('builtins', 'bytearray'), ('builtins', 'set'),
+                          ('builtins', 'frozenset'), ('builtins', 'slice'), ('builtins', 'range'),
+                          ('datetime', 'date'), ('datetime', 'time'), ('datetime', 'datetime'),
+                          ('datetime', 'timedelta'), ('datetime', 'timezone'), ('decimal', 'Decimal')])
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if (module, name) not in SAFE_GLOBALS:
+            raise pickle.UnpicklingError("{}.{} is not allowed in replicated values".format(module, name))
+        return super().find_class(module, name)
+
+
+def restricted_loads(payload: bytes):
+    """
+    Unpickle plain data: numbers, strings, bytes, containers and the types in `SAFE_GLOBALS`. Other classes (including
+    NumPy arrays, which are replicated as arrays anyway) raise `pickle.UnpicklingError`.
+    """
+    return _RestrictedUnpickler(io.BytesIO(payload)).load()
+
+
+def _is_plain_array(np, value) -> bool:
+    return np is not None and isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+
+def _xor(np, a, b):
+    return np.bitwise_xor(a.reshape(-1).view(np.uint8), b.reshape(-1).view(np.uint8))
+
+
+def _encode_array(value, compress_level: int) -> bytes:
+    dtype_str = value.dtype.str.encode()
+    shape = struct.pack('<{}Q'.format(value.ndim), *value.shape)
+    return b''.join([_ARRAY.pack(len(dtype_str), value.ndim), dtype_str, shape,
+                     zlib.compress(value.tobytes(), compress_level)])
+
+
+def _decode_array(np, payload: bytes):
+    """The inverse of `_encode_array`."""
+    dtype_length, ndim = _ARRAY.unpack_from(payload, 0)
+    offset = _ARRAY.size
+    dtype = np.dtype(payload[offset:offset + dtype_length].decode())
+    offset += dtype_length
+    shape = struct.unpack_from('<{}Q'.format(ndim), payload, offset)
+    offset += 8 * ndim
+    data = zlib.decompress(payload[offset:])
+    return np.frombuffer(data, dtype=dtype).reshape(shape)
+
+
+class Publisher:
+    """
+    Sends values of `observables` (a mapping from names to observables) through `sock` (a connected stream socket):
+    all of them when started and then the changed ones after each refresh wave, in one frame per wave.
+
+    Frames are encoded at the end of the wave, but written by a writer thread, so a slow peer doesn't block the
+    refresher (frames are queued for it instead, see `pending_frames`). `stop` waits until queued frames are written.
+    """
+
+    def __init__(self, observables: Mapping[str, Observable], sock, compress_level: int = 1):
+        self.observables = dict(observables)
+        self.sock = sock
+        self.compress_level = compress_level
+        self.waves = 0
+        self.bytes_sent = 0  # in frames queued for writing
+        self.values_sent = 0
+        self.error = None  # type: Optional[OSError]  # stops the writer
+        self._last_arrays = {}  # type: Dict[str, object]  # the last arrays sent, for delta encoding
+        self._collector = WaveCollector(self._send, name='replicate')
+        self._frames = queue.Queue()  # type: queue.Queue  # of bytes, None stops the writer
+        self._writer = None  # type: Optional[threading.Thread]
+        self._started = False
+
+    def start(self):
+        """Send the current values and start following changes."""
+        assert not self._started
+        self._started = True
+        self._writer = threading.Thread(target=self._write_frames, name='replication writer', daemon=True)
+        self._writer.start()
+        self._send(list(self.observables))
+        for name, observable in self.observables.items():
+            self._collector.add(name, observable)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop following changes and wait (up to `timeout` seconds) until the queued frames are written."""
+        self._collector.clear()
+        if self._writer is not None:
+            self._frames.put(None)
+            self._writer.join(timeout)
+            self._writer = None
+
+    def pending_frames(self) -> int:
+        """The number of frames not written yet."""
+        return self._frames.qsize()
+
+    def _write_frames(self):
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            if self.error is not None:
+                continue  # dropped, the peer is gone
+            try:
+                self.sock.sendall(frame)
+            except OSError as e:
+                logger.warning('replication stopped: %r', e)
+                self.error = e
+
+    def _send(self, names: List[str]):
+        np = optional_numpy()
+        records = []
+        for name in names:
+            try:
+                value = ev(self.observables[name])
+            except (EvError, NotInitializedError, FinalizedError):
+                logger.debug('not replicating %s, it has no valid value', name)
+                continue
+            records.append(self._encode(np, name, value))
+        frame = b''.join(records)
+        self._frames.put(_FRAME.pack(len(frame), self.waves, len(records)) + frame)
+        self.waves += 1
+        self.values_sent += len(records)
+        self.bytes_sent += _FRAME.size + len(frame)
+
+    def _encode(self, np, name: str, value) -> bytes:
+        if _is_plain_array(np, value):
+            value = np.ascontiguousarray(value)
+            previous = self._last_arrays.get(name)
+            self._last_arrays[name] = value.copy()
+            if previous is not None and previous.shape == value.shape and previous.dtype == value.dtype:
+                kind, payload = ARRAY_DELTA, _encode_array(_xor(np, value, previous), self.compress_level)
+            else:
+                kind, payload = ARRAY, _encode_array(value, self.compress_level)
+        else:
+            self._last_arrays.pop(name, None)
+            kind, payload = PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        encoded_name = name.encode()
+        return b''.join([_RECORD.pack(kind, len(encoded_name)), encoded_name, _LENGTH.pack(len(payload)), payload])
+
+
+def _recv_exactly(sock, size: int) -> Optional[bytes]:
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+class Replica:
+    """
+    Receives frames sent by a `Publisher` and assigns the values to `vars` (a mapping from names to vars; missing ones
+    are created as `Var`s), each frame in one `UpdateTransaction`.
+
+    Arguments:
+        decode: Turns a pickled payload into a value; `restricted_loads` by default. Pass `pickle.loads` to replicate
+                arbitrary objects, but only if the peer is trusted: unpickling can run any code.
+    """
+
+    def __init__(self, sock, vars: Optional[Mapping[str, Observable]] = None,
+                 decode: Callable[[bytes], object] = restricted_loads):
+        self.sock = sock
+        self.decode = decode
+        self.vars = dict(vars or {})  # type: Dict[str, Observable]
+        self.waves = 0
+        self.bytes_received = 0
+        self.last_wave = None  # type: Optional[int]
+        self._last_arrays = {}  # type: Dict[str, object]
+
+    def receive(self) -> bool:
+        """Receive and apply one frame; returns False if the peer has closed the connection."""
+        header = _recv_exactly(self.sock, _FRAME.size)
+        if header is None:
+            return False
+        length, wave, count = _FRAME.unpack(header)
+        body = _recv_exactly(self.sock, length)
+        if body is None:
+            return False
+        self.bytes_received += _FRAME.size + len(body)
+        values = self._decode(body, count)
+        with UpdateTransaction():
+            for name, value in values:
+                var = self.vars.get(name)
+                if var is None:
+                    var = self.vars[name] = Var()
+                var.__assign__(value)
+        self.waves += 1
+        self.last_wave = wave
+        return True
+
+    def serve(self):
+        """Apply frames until the peer closes the connection."""
+        while self.receive():
+            pass
+
+    def _decode(self, body: bytes, count: int) -> List[Tuple[str, object]]:
+        np = optional_numpy()
+        values = []
+        offset = 0
+        for _ in range(count):
+            kind, name_length = _RECORD.unpack_from(body, offset)
+            offset += _RECORD.size
+            name = body[offset:offset + name_length].decode()
+            offset += name_length
+            payload_length, = _LENGTH.unpack_from(body, offset)
+            offset += _LENGTH.size
+            payload = body[offset:offset + payload_length]
+            offset += payload_length
+            if kind == PICKLE:
+                value = self.decode(payload)
+                self._last_arrays.pop(name, None)
+            elif kind == ARRAY:
+                value = _decode_array(np, payload)
+                self._last_arrays[name] = value
+            elif kind == ARRAY_DELTA:
+                previous = self._last_arrays[name]
+                value = _xor(np, _decode_array(np, payload), previous).view(previous.dtype).reshape(previous.shape)
+                self._last_arrays[name] = value
+            else:
+                raise ValueError("unknown record kind {}".format(kind))
+            values.append((name, value))
+        return values
@@ -0,0 +1,89 @@
+"""
+Scoped ownership of reactive nodes, so a whole subgraph can be released at once.
+"""
+
+import logging
+from typing import List
+
+logger = logging.getLogger('scope')
+
+active_scopes = []  # type: List[Scope]  # a stack of entered scopes; nodes are recorded by the innermost one
+
+
+class Scope:
+    """
+    Records every `Var`, `CallResult`, `Cache` and `Notifier` created while the scope is entered (with `with scope:`)
+    and keeps them alive until `dispose()` is called, which detaches them from the graph, finalizes them and drops the
+    references in one pass (instead of relying on `__del__` and the garbage collector).
+
+    A scope may be entered many times; nested scopes are allowed (nodes belong to the innermost one).
+    """
+
+    def __init__(self, name: str = ''):
+        self.name = name
+        self.disposed = False
+        self._observables = []
+        self._notifiers = []
+
+    def __enter__(self) -> 'Scope':
+        if self.disposed:
+            raise RuntimeError("scope '{}' is already disposed".format(self.name))
+        active_scopes.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        assert active_scopes[-1] is self, "scopes should be exited in the reverse order"
+        active_scopes.pop()
+
+    def __len__(self):
+        return len(self._observables) + len(self._notifiers)
+
+    def own_observable(self, observable):
+        self._observables.append(observable)
+
+    def own_notifier(self, notifier):
+        self._notifiers.append(notifier)
+
+    def dispose(self):
+        """
+        Detach all owned notifiers from each other and from the rest of the graph, finalize owned observables and
+        release them. Notifiers outside the scope stay consistent (e.g. they become inactive if the only active
+        observers were in the scope).
+        """
+        if self.disposed:
+            return
+        from stateflow.call_result import CallResult
+        from stateflow.var import CacheBase, Var
+
+        inside = set(self._notifiers)
+        for n in inside:
+            n._forced_active = False
+        for n in inside:
+            for observed in list(n._observed):
+                if observed not in inside:
+                    observed.remove_observer(n)  # updates activeness of the outer part of the graph
+            for observer in list(n._observers):
+                if observer not in inside:
+                    observer._observed.discard(n)
+            n._observers.clear()
+            n._active_observers.clear()
+            n._observed.clear()
+            n._is_active = False
+            n._called_when_inactive = False
+
+        for observable in reversed(self._observables):
+            try:
+                if isinstance(observable, CacheBase):
+                    # not `__finalize__`, which would finalize the inner observable that may be owned by someone else
+                    observable._cache_is_valid = False
+                    observable._cached_value = None
+                    observable._cached_exception = None
+                elif isinstance(observable, (Var, CallResult)):
+                    observable.__finalize__()
+            except Exception:
+                logger.exception("ignoring exception when finalizing {!r}".format(observable))
+
+        self._observables.clear()
+        self._notifiers.clear()
+        self.disposed = True
+
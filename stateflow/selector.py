@@ -0,0 +1,107 @@
+"""
+Nodes that follow a part of a large value and notify only when that part changes.
+"""
+
+import operator
+from typing import Any, Callable, Optional, Union
+
+from stateflow.common import Observable, T, ev
+from stateflow.forwarders import ConstForwarders
+from stateflow.notifier import Notifier
+from stateflow.scope import active_scopes
+from stateflow.wrapping import interned_forwarder
+
+_UNSET = object()
+
+
+def _project_key(value, key):
+    if hasattr(value, '__getitem__'):
+        return value[key]
+    return getattr(value, key)
+
+
+def _same_exception(a: Optional[Exception], b: Optional[Exception]) -> bool:
+    if a is None or b is None:
+        return a is b
+    return type(a) is type(b) and a.args == b.args
+
+
+class Selector(Observable[T], ConstForwarders):
+    """
+    The projection of the value of `source`. It's computed when the source notifies; the selector notifies its
+    observers only if the projected value has changed according to `eq` (or if it can't be compared, e.g. NumPy
+    arrays with the default `eq`). It's a single node (instead of a `CallResult` with a `Cache`), so many selectors of
+    one source are cheap.
+
+    When the selector is not active, the projection is computed on reads instead.
+    """
+
+    repr_name = 'Selector'
+
+    def __init__(self, source: Observable, projection: Callable[[Any], T], eq: Callable[[T, T], bool] = operator.eq,
+                 name: str = ''):
+        super().__init__()
+        self._source = source
+        self._projection = projection
+        self._eq = eq
+        self._value = _UNSET  # or the last projected value
+        self._exception = None
+        self._version = 0  # increased when the projected value changes
+        self.projections = 0
+        self._notifier = Notifier(self._source_changed, name='Selector {}'.format(name), owner=self)
+        source.__notifier__().add_observer(self._notifier)
+        if active_scopes:
+            active_scopes[-1].own_observable(self)
+
+    def __notifier__(self) -> Notifier:
+        return self._notifier
+
+    def __eval__(self) -> T:
+        if self._value is _UNSET or not self._notifier._is_active:
+            self._project()
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+    def _source_changed(self) -> bool:
+        return self._project()
+
+    def _project(self) -> bool:
+        """Compute the projection; returns whether it has changed."""
+        self.projections += 1
+        try:
+            value = self._projection(ev(self._source))
+            exception = None
+        except Exception as e:
+            value = None
+            exception = e
+        old_value, old_exception = self._value, self._exception
+        self._value, self._exception = value, exception
+        if old_value is _UNSET:
+            changed = False  # nobody has read a value yet (as in `Cache`)
+        elif exception is not None or old_exception is not None:
+            # a projection failing the same way again (e.g. a missing key) is not a change
+            changed = not _same_exception(old_exception, exception)
+        else:
+            try:
+                changed = not self._eq(old_value, value)
+            except Exception:  # e.g. the truth value of an array is ambiguous
+                changed = True
+        if changed:
+            self._version += 1
+        return changed
+
+
+def select(source: Observable, key_or_fn: Union[Any, Callable[[Any], T]], eq: Optional[Callable[[T, T], bool]] = None) \
+        -> Selector[T]:
+    """
+    A `Selector` of `source[key]` (or the attribute `key` if the value has no items, e.g. a dataclass), or of
+    `key_or_fn(value)` if it's callable. Selectors of the same source, key (or function) and `eq` are shared while
+    they are alive.
+    """
+    if callable(key_or_fn):
+        projection, name = key_or_fn, getattr(key_or_fn, '__name__', '?')
+    else:
+        projection, name = (lambda value: _project_key(value, key_or_fn)), repr(key_or_fn)
+    return interned_forwarder(source, 'select', (key_or_fn, eq),
+                              lambda: Selector(source, projection, eq or operator.eq, name=name))
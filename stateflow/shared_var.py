@@ -0,0 +1,205 @@
+"""
+`Var`s holding NumPy arrays in shared memory, so several processes can use the same (large) inputs without copying.
+
+A shared block consists of a header (a sequence counter, the dtype and the shape) and the array data. Every process
+that attaches a `SharedVar` listens on a Unix datagram socket in a directory named after the block. An assignment
+writes the data in place and sends the new sequence number to all the other sockets, so each process can notify its
+local `Notifier` after `poll()` (e.g. called when `fileno()` becomes readable in a selector or an event loop).
+The payload itself is never pickled nor sent.
+"""
+
+import logging
+import os
+import socket
+import struct
+import sys
+import tempfile
+import time
+from contextlib import suppress
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+from stateflow.tracing import active_subscribers
+from stateflow.var import FINALIZED, Var
+
+logger = logging.getLogger('shared_var')
+
+_HEADER = struct.Struct('<Q16sQ8Q')  # sequence, dtype, number of dimensions, shape
+_SEQUENCE = struct.Struct('<Q')
+DATA_OFFSET = 128
+MAX_DIMS = 8
+
+
+def _subscribers_dir(block_name: str) -> str:
+    return os.path.join(tempfile.gettempdir(), 'stateflow-' + block_name.lstrip('/'))
+
+
+class SharedVar(Var):
+    """
+    A `Var` with an array stored in a shared memory block. Create it with `SharedVar.create(array)` in one process and
+    attach it with `SharedVar.attach(name)` in others. The shape and dtype are fixed; assigned values are copied into
+    the block (there should be one writer at a time). Only NumPy arrays (and values convertible to arrays of the same
+    shape and dtype) are supported: objects and configuration values like dicts would have to be pickled, use an
+    ordinary `Var` for them.
+
+    The evaluated value is a read-only view of the shared block. A write in another process may be in progress while
+    it's used; `read()` returns a consistent copy (the sequence counter works as a seqlock: it's odd during writes).
+
+    Notifications from other processes are delivered by `poll()`, which should be called when `fileno()` is readable
+    (see `add_to_loop`).
+    """
+
+    repr_name = 'SharedVar'
+
+    def __init__(self, block: shared_memory.SharedMemory, owner: bool):
+        import numpy as np
+
+        _, dtype, ndim, *shape = _HEADER.unpack_from(block.buf, 0)
+        self._block = block
+        self._owner = owner
+        array = np.ndarray(tuple(shape[:ndim]), dtype=np.dtype(dtype.rstrip(b'\0').decode()), buffer=block.buf,
+                           offset=DATA_OFFSET)
+        self._array = array
+        view = array.view()
+        view.flags.writeable = False
+        super().__init__(view)
+        self._notifier.name = f'SharedVar[{block.name}]'
+        self._seen_sequence = self.sequence
+        self.received = 0  # notifications received from other processes
+
+        self._dir = _subscribers_dir(block.name)
+        self._socket_path = os.path.join(self._dir, '{}-{:x}.sock'.format(os.getpid(), id(self)))
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._socket.bind(self._socket_path)
+
+    @classmethod
+    def create(cls, value, name: Optional[str] = None) -> 'SharedVar':
+        """Allocate a shared block for an array like `value` (and copy it there)."""
+        import numpy as np
+
+        value = np.ascontiguousarray(value)
+        if value.dtype.hasobject:
+            raise TypeError("arrays of objects cannot be shared")
+        if value.ndim > MAX_DIMS:
+            raise ValueError("at most {} dimensions are supported".format(MAX_DIMS))
+        block = shared_memory.SharedMemory(name=name, create=True, size=DATA_OFFSET + max(value.nbytes, 1))
+        shape = list(value.shape) + [0] * (MAX_DIMS - value.ndim)
+        _HEADER.pack_into(block.buf, 0, 0, value.dtype.str.encode(), value.ndim, *shape)
+        os.makedirs(_subscribers_dir(block.name), exist_ok=True)
+        shared_var = cls(block, owner=True)
+        shared_var._array[...] = value
+        return shared_var
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedVar':
+        """Attach a block created (possibly in another process) with `create`."""
+        if sys.version_info >= (3, 13):
+            # the block is unlinked by its owner, not by the resource tracker of an attached process
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+            # otherwise the resource tracker unlinks the block when this process exits (and warns about a leak)
+            resource_tracker.unregister(block._name, 'shared_memory')
+        return cls(block, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._block.name
+
+    @property
+    def sequence(self) -> int:
+        """Increased by 2 with each write; odd while a write is in progress."""
+        return _SEQUENCE.unpack_from(self._block.buf, 0)[0]
+
+    def fileno(self) -> int:
+        return self._socket.fileno()
+
+    def __assign__(self, value):
+        if self._value is FINALIZED:
+            raise ValueError("the shared var is closed")
+        if active_subscribers:
+            for subscriber in active_subscribers:
+                subscriber.on_assign(self, value)
+        sequence = self.sequence
+        _SEQUENCE.pack_into(self._block.buf, 0, sequence + 1)
+        try:
+            self._array[...] = value
+        finally:
+            _SEQUENCE.pack_into(self._block.buf, 0, sequence + 2)
+        self._seen_sequence = sequence + 2
+        self._broadcast(sequence + 2)
+        self._notifier.notify()
+
+    def _broadcast(self, sequence: int):
+        message = _SEQUENCE.pack(sequence)
+        for entry in os.listdir(self._dir):
+            path = os.path.join(self._dir, entry)
+            if path == self._socket_path:
+                continue
+            try:
+                self._socket.sendto(message, path)
+            except BlockingIOError:
+                pass  # the receiver has notifications pending anyway
+            except (ConnectionRefusedError, FileNotFoundError):
+                logger.debug('removing stale subscriber %s', path)
+                with suppress(OSError):
+                    os.unlink(path)
+
+    def poll(self) -> bool:
+        """Consume notifications sent by other processes; notify the local notifier if the value has changed."""
+        got = False
+        while True:
+            try:
+                self._socket.recv(_SEQUENCE.size)
+            except (BlockingIOError, InterruptedError):
+                break
+            got = True
+            self.received += 1
+        sequence = self.sequence
+        if got and sequence != self._seen_sequence:
+            self._seen_sequence = sequence
+            self._notifier.notify()
+            return True
+        return False
+
+    def read(self, timeout: float = 1.0):
+        """
+        Return a consistent copy of the array (retrying if it was written in the meantime). Raises `TimeoutError` if
+        there was no consistent copy in `timeout` seconds, e.g. when a writer died in the middle of a write.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            before = self.sequence
+            if before % 2 == 0:
+                copy = self._array.copy()
+                if self.sequence == before:
+                    return copy
+            if time.monotonic() > deadline:
+                raise TimeoutError("no consistent copy of {} in {} s (sequence {})".format(self.name, timeout, before))
+
+    def add_to_loop(self, loop):
+        """Call `poll()` whenever a notification arrives (`loop` is an asyncio event loop)."""
+        loop.add_reader(self.fileno(), self.poll)
+
+    def close(self):
+        """Detach from the block (and unlink it, if this process created it)."""
+        if self._value is FINALIZED:
+            return
+        self._value = FINALIZED
+        self._array = None
+        self._socket.close()
+        with suppress(OSError):
+            os.unlink(self._socket_path)
+        try:
+            self._block.close()
+        except BufferError:
+            logger.debug('%s is still used by arrays, it will be unmapped when they are released', self.name)
+        if self._owner:
+            self._block.unlink()
+            with suppress(OSError):
+                os.rmdir(self._dir)
+
+    def __finalize__(self):
+        self.close()
+
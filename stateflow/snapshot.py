@@ -0,0 +1,150 @@
+"""
+Saving values of a graph to a file and restoring them after a restart (so the graph doesn't need to be recomputed).
+
+The file consists of a header, a pickled index and a data section. NumPy arrays are stored in the data section and
+are memory-mapped on restore (copy-on-write), so they are loaded without copying. Other values are pickled.
+"""
+
+import os
+import pickle
+import struct
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from stateflow.call_result import CmCallResult
+from stateflow.common import Observable
+from stateflow.internal_utils import optional_numpy
+from stateflow.notifier import refresh_notifiers
+from stateflow.sync_refresher import UpdateTransaction
+from stateflow.var import FINALIZED, NOT_INITIALIZED, CacheBase, Var
+
+MAGIC = b'SFSNAP01'
+_HEADER = struct.Struct('<8sQ')  # magic, length of the pickled index
+ALIGNMENT = 64
+
+VAR = 'var'
+CACHE = 'cache'
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _is_mappable_array(np, value) -> bool:
+    return np is not None and isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+
+def _node_value(name: str, node: Observable) -> Tuple[Optional[str], Any]:
+    """Return the kind of the node and its value, or (None, None) if there is nothing valid to store."""
+    if isinstance(node, Var):
+        if node._value is NOT_INITIALIZED or node._value is FINALIZED:
+            return None, None
+        return VAR, node._value
+    elif isinstance(node, CacheBase):
+        if not node._cache_is_valid or node._cached_exception is not None:
+            return None, None
+        if isinstance(node._inner, CmCallResult):
+            # the value is valid only while the context manager is entered, it cannot be restored without calling it
+            return None, None
+        return CACHE, node._cached_value
+    else:
+        raise TypeError("cannot snapshot '{}': only Var and Cache nodes are supported (got {})"
+                        .format(name, type(node).__name__))
+
+
+def snapshot(roots: Mapping[str, Observable], path: str) -> List[str]:
+    """
+    Save values of `Var`s and valid values of `Cache`s to a file. `roots` maps stable names (that are used to match
+    the nodes on restore) to nodes. Returns names of saved nodes.
+    """
+    np = optional_numpy()
+    index = {}  # type: Dict[str, tuple]
+    arrays = []
+    data_size = 0
+    for name, node in roots.items():
+        kind, value = _node_value(name, node)
+        if kind is None:
+            continue
+        if _is_mappable_array(np, value):
+            value = np.ascontiguousarray(value)
+            data_size = _aligned(data_size)
+            index[name] = (kind, 'array', value.dtype.str, value.shape, data_size)
+            arrays.append((data_size, value))
+            data_size += value.nbytes
+        else:
+            index[name] = (kind, 'pickle', value)
+
+    index_bytes = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+    data_start = _aligned(_HEADER.size + len(index_bytes))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for offset, array in arrays:
+            f.seek(data_start + offset)
+            f.write(array.data)
+        f.truncate(data_start + data_size)
+    os.replace(tmp_path, path)
+    return list(index)
+
+
+def _load(path: str) -> Tuple[dict, int]:
+    with open(path, 'rb') as f:
+        magic, index_size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("'{}' is not a stateflow snapshot".format(path))
+        index = pickle.loads(f.read(index_size))
+    return index, _aligned(_HEADER.size + index_size)
+
+
+def _load_value(np, path: str, data_start: int, entry: tuple):
+    if entry[1] == 'pickle':
+        return entry[2]
+    _, _, dtype, shape, offset = entry
+    if np is None:
+        raise ImportError("numpy is needed to restore arrays from a snapshot")
+    dtype = np.dtype(dtype)
+    if dtype.itemsize == 0 or 0 in shape:
+        return np.empty(shape, dtype)  # mmap cannot map an empty range
+    return np.memmap(path, dtype=dtype, mode='c', offset=data_start + offset, shape=shape)
+
+
+def restore(roots: Mapping[str, Observable], path: str) -> List[str]:
+    """
+    Restore values saved with `snapshot` into nodes with the same names. Names that are missing in `roots` or in the
+    snapshot are ignored. Returns names of restored nodes.
+
+    It's meant to be called on a freshly built graph: `Var`s are assigned (so dependents evaluated before, e.g. caches
+    of `NotInitializedError`, are invalidated) and then caches are marked valid, so nothing is recomputed until some
+    input is assigned again.
+    """
+    np = optional_numpy()
+    index, data_start = _load(path)
+    restored = []
+    caches = []
+    with UpdateTransaction():
+        for name, entry in index.items():
+            node = roots.get(name)
+            if node is None:
+                continue
+            value = _load_value(np, path, data_start, entry)
+            if entry[0] == VAR:
+                if not isinstance(node, Var):
+                    raise TypeError("'{}' was saved from a Var, cannot restore it into {}"
+                                    .format(name, type(node).__name__))
+                node.__assign__(value)
+                restored.append(name)
+            else:
+                if not isinstance(node, CacheBase):
+                    raise TypeError("'{}' was saved from a Cache, cannot restore it into {}"
+                                    .format(name, type(node).__name__))
+                caches.append((name, node, value))
+
+    # after the assignments were propagated, so they don't invalidate restored values; inactive caches are refreshed
+    # (calls pending upstream run now), otherwise they would catch up with the assignments when activated
+    refresh_notifiers(*[node.__notifier__() for _, node, _ in caches])
+    for name, node, value in caches:
+        node._cached_value = value
+        node._cached_exception = None
+        node._cache_is_valid = True
+        restored.append(name)
+    return restored
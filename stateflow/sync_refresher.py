@@ -1,9 +1,11 @@
-import asyncio
 import gc
 import logging
 import sys
 from contextlib import suppress
-from typing import Any, NamedTuple
+from typing import Any, NamedTuple, Optional
+
+from stateflow.bucket_queue import BucketQueue, QueueEmpty
+from stateflow.tracing import active_subscribers
 
 #FIXME: remove this logging configuration
 # stderr_logger_handler = logging.StreamHandler(stream=sys.stderr)
@@ -24,50 +26,70 @@ class QueueItem(NamedTuple):
 
 
 class SyncRefresher:
+    # run `gc.collect()` before and after each run (not needed if subgraphs are disposed with `Scope`)
+    collect_garbage = True
+
     def __init__(self):
-        self.queue = asyncio.PriorityQueue()
+        self.queue = BucketQueue()
         self._updates_in_progress = 0
+        self._running_priority = None  # type: Optional[int]  # priority of the notifier being called
+
+    @property
+    def running(self) -> bool:
+        return self._running_priority is not None
 
     def schedule_call(self, notifier: 'Notifier'):
-        logger.debug('  scheduled notification ({}) [{:X}] {}'.format(notifier.priority, id(notifier), notifier.name))
+        if active_subscribers:
+            for subscriber in active_subscribers:
+                subscriber.on_schedule(notifier)
         t = QueueItem(notifier.priority, notifier, notifier, notifier.stats)
         self.queue.put_nowait(t)
+        if self._running_priority is not None and notifier.priority > self._running_priority:
+            return  # the running loop gets to it (levels are processed in order), no need for a nested run
         self.maybe_run()
 
     def force_run(self, max_priority=None):
-        gc.collect()
-        update_next = None
-
-        notified_notifiers = set()
-        with suppress(asyncio.QueueEmpty):  # it's ok - if the queue is empty we just exit
+        if self.collect_garbage:
+            gc.collect()
+
+        running_priority = self._running_priority  # not None if it's a nested run
+        if active_subscribers:
+            for subscriber in active_subscribers:
+                subscriber.on_wave_begin(self)
+        try:
+            self._call_queued(max_priority)
+        finally:
+            self._running_priority = running_priority
+            if active_subscribers:
+                for subscriber in active_subscribers:
+                    subscriber.on_wave_end(self)
+        if self.collect_garbage:
+            gc.collect()
+
+    def _call_queued(self, max_priority):
+        with suppress(QueueEmpty):  # it's ok - if the queue is empty we just exit
             while True:
-                notification = update_next if update_next else self.queue.get_nowait()  # type: QueueItem
+                notification = self.queue.get_nowait()  # type: QueueItem  # the queue keeps no duplicates
                 if max_priority is not None and notification.priority > max_priority:
                     self.queue.put_nowait(notification)
                     break
-                try:
-                    update_next = self.queue.get_nowait()
-                    if update_next.id == notification.id:  # skip notification if is same as next
-                        continue
-                except asyncio.QueueEmpty:
-                    update_next = None
+                self._running_priority = notification.priority
 
+                notifier = notification.notifier
+                exception = None
+                if active_subscribers:
+                    for subscriber in active_subscribers:
+                        subscriber.on_call_begin(notifier)
                 try:
                     notification.stats['calls'] = notification.stats.get('calls', 0) + 1
-                    notifier = notification.notifier
-                    if notifier in notified_notifiers:
-                        logger.debug('notifier [{:X}] {} called more than once'.format(id(notifier), notifier.name))
-                    notified_notifiers.add(notifier)
-                    logger.debug('call notification ({}) [{:X}] {}'.format(notifier.priority, id(notifier),
-                                                                           notifier.name))
-
                     notifier.call()
-                    notification.stats['exception'] = None
-
                 except Exception as e:
-                    logger.exception('ignoring exception when in notifying observer {}'.format(notification.notifier))
-                    notification.stats['exception'] = e
-        gc.collect()
+                    logger.exception('ignoring exception when in notifying observer {}'.format(notifier))
+                    exception = e
+                notification.stats['exception'] = exception
+                if active_subscribers:
+                    for subscriber in active_subscribers:
+                        subscriber.on_call_end(notifier, exception)
 
     def maybe_run(self):
         """
@@ -89,13 +111,27 @@ def get_default_refresher():
 
 
 def wait_for_var(var=None):
-    get_default_refresher().force_run(max_priority=var.__notifier__().priority if var is not None else None)
+    if var is None:
+        get_default_refresher().force_run()
+    else:
+        notifier = var.__notifier__()
+        notifier.refresher.force_run(max_priority=notifier.priority)
 
 
 class UpdateTransaction:
+    """
+    Defer calling notifiers until the end of the transaction (of `refresher`, the default synchronous one if None). An
+    `AsyncRefresher` starts its wave after the transaction, in its task.
+    """
+
+    def __init__(self, refresher=None):
+        self.refresher = refresher
+
     def __enter__(self):
-        get_default_refresher()._updates_in_progress += 1
+        if self.refresher is None:
+            self.refresher = get_default_refresher()
+        self.refresher._updates_in_progress += 1
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        get_default_refresher()._updates_in_progress -= 1
-        get_default_refresher().maybe_run()
+        self.refresher._updates_in_progress -= 1
+        self.refresher.maybe_run()
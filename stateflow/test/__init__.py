@@ -0,0 +1,16 @@
+from typing import Any, Callable, Sequence, Union
+
+from stateflow import Notifier
+from stateflow.common import Observable
+
+
+def sink(observables: Union[Observable, Sequence[Observable]], callback: Callable[[], Any]) -> Notifier:
+    """
+    A forced-active notifier that calls `callback` whenever one of `observables` notifies (once per wave). It's
+    observed weakly, so the caller has to keep it. Note that a cache notifies only if its value was read since the
+    last change.
+    """
+    n = Notifier(lambda: callback() or True, forced_active=True)
+    for observable in observables if isinstance(observables, (list, tuple)) else [observables]:
+        observable.__notifier__().add_observer(n)
+    return n
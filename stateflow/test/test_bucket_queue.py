@@ -0,0 +1,46 @@
+import unittest
+
+from stateflow.bucket_queue import BucketQueue, QueueEmpty
+from stateflow.sync_refresher import QueueItem
+
+
+def item(priority, id):
+    return QueueItem(priority, id, None, {})
+
+
+class BucketQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.queue = BucketQueue()
+
+    def get_all(self):
+        result = []
+        while not self.queue.empty():
+            result.append(self.queue.get_nowait().id)
+        return result
+
+    def test_priority_order(self):
+        for priority, id in [(3, 'c'), (0, 'a'), (7, 'd'), (1, 'b'), (3, 'c2')]:
+            self.queue.put_nowait(item(priority, id))
+        self.assertEqual(5, self.queue.qsize())
+        self.assertEqual('a', self.queue.peek().id)
+        self.assertEqual(['a', 'b', 'c', 'c2', 'd'], self.get_all())
+        with self.assertRaises(QueueEmpty):
+            self.queue.get_nowait()
+
+    def test_duplicates_are_dropped(self):
+        self.queue.put_nowait(item(1, 'a'))
+        self.queue.put_nowait(item(1, 'a'))
+        self.assertEqual(1, self.queue.qsize())
+        self.assertEqual(1, self.queue.deduplicated)
+        self.assertEqual(['a'], self.get_all())
+        self.queue.put_nowait(item(1, 'a'))  # may be queued again once taken
+        self.assertEqual(['a'], self.get_all())
+
+    def test_put_while_taking_a_level(self):
+        for id in 'abc':
+            self.queue.put_nowait(item(5, id))
+        self.assertEqual('a', self.queue.get_nowait().id)
+        self.queue.put_nowait(item(2, 'x'))  # below the level being taken
+        self.queue.put_nowait(item(5, 'd'))  # the same level
+        self.queue.put_nowait(item(6, 'e'))
+        self.assertEqual(['x', 'b', 'c', 'd', 'e'], self.get_all())
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+from stateflow import ev, reactive, var, volatile
+from stateflow.cache_manager import disable_cache_manager, enable_cache_manager, value_size
+
+calls = []
+
+
+@reactive
+def block(n, fill):
+    calls.append((n, fill))
+    return np.full(n, fill, dtype=np.float64)
+
+
+@reactive
+def total(a):
+    return float(a.sum())
+
+
+class CacheManagerTests(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+        self.manager = enable_cache_manager(max_bytes=2500)
+
+    def tearDown(self):
+        disable_cache_manager()
+
+    def test_value_size(self):
+        self.assertEqual(800, value_size(np.zeros(100)))
+        self.assertGreater(value_size('abc'), 0)
+
+    def test_least_recently_read_are_evicted_and_recomputed(self):
+        n = var(100)
+        a, b, c = block(n, 1), block(n, 2), block(n, 3)  # 800 bytes each
+        ev(a)
+        ev(b)
+        ev(a)  # b is the least recently read now
+        self.assertEqual(1600, self.manager.total_bytes)
+        ev(c)
+        self.assertEqual(2400, self.manager.total_bytes)
+        self.assertEqual(0, self.manager.evictions)
+        d = block(n, 4)
+        ev(d)
+        self.assertEqual(1, self.manager.evictions)
+        self.assertEqual(800, self.manager.evicted_bytes)
+        self.assertEqual(2400, self.manager.total_bytes)
+
+        calls.clear()
+        ev(a)
+        ev(c)
+        self.assertEqual([], calls)
+        self.assertEqual(2.0, ev(b)[0])
+        self.assertEqual([(100, 2)], calls)
+        self.assertEqual(1, self.manager.recomputations)
+        self.assertEqual({'entries', 'total_bytes', 'max_bytes', 'evictions', 'evicted_bytes', 'recomputations'},
+                         set(self.manager.stats()))
+
+    def test_eviction_does_not_notify_but_changes_are_forwarded(self):
+        fill = var(1)
+        res = block(1000, fill)  # 8000 bytes, more than the budget but it's the most recently read one
+        s = total(res)
+        cbk = Mock()
+        sink = volatile(reactive(cbk)(s))
+        cbk.assert_called_once_with(1000.0)
+        ev(block(var(10), 0))  # evicts the big one
+        self.assertEqual(1, self.manager.evictions)
+        cbk.assert_called_once()
+
+        fill @= 2  # the evicted cache still forwards the change to dependents
+        cbk.assert_called_with(2000.0)
+        self.assertEqual(2, cbk.call_count)
@@ -0,0 +1,118 @@
+import threading
+import unittest
+
+from stateflow import EvError, assign, computed, ev, reactive, var
+from stateflow.test import sink
+
+
+class ComputedTests(unittest.TestCase):
+    def setUp(self):
+        self.flag, self.b, self.c = var(True), var(1), var(2)
+
+        @computed
+        def choose(flag, b, c):
+            return ev(b) if ev(flag) else ev(c)
+
+        self.choose = choose(self.flag, self.b, self.c)
+
+    def sink(self, observable):
+        self.seen = []
+        n = sink(observable, lambda: self.seen.append(ev(observable)))
+        ev(observable)
+        return n
+
+    def test_depends_on_read_observables(self):
+        keep = self.sink(self.choose)
+        self.assertEqual([self.flag, self.b], self.choose.dependencies)
+        self.assertTrue(self.b.__notifier__().active)
+        self.assertFalse(self.c.__notifier__().active)  # the branch not taken
+
+        calls = self.choose.calls
+        assign(self.c, 20)
+        self.assertEqual(calls, self.choose.calls)
+        self.assertEqual([], self.seen)
+
+        assign(self.b, 10)
+        self.assertEqual([10], self.seen)
+
+        assign(self.flag, False)
+        self.assertEqual([10, 20], self.seen)
+        self.assertEqual([self.flag, self.c], self.choose.dependencies)
+        self.assertFalse(self.b.__notifier__().active)
+        self.assertTrue(self.c.__notifier__().active)
+        calls = self.choose.calls
+        assign(self.b, 100)
+        self.assertEqual(calls, self.choose.calls)
+
+    def test_reads_inside_reactive_functions_are_not_dependencies(self):
+        a = var(1)
+        inc = reactive(lambda x: x + 1)(a)
+
+        @computed
+        def read():
+            return ev(inc) * 2
+
+        r = read()
+        self.assertEqual(4, ev(r))
+        self.assertEqual([inc], r.dependencies)
+        keep = self.sink(r)
+        assign(a, 2)
+        self.assertEqual([6], self.seen)
+
+    def test_nested_computed(self):
+        @computed
+        def outer():
+            return ev(self.choose) + 1
+
+        o = outer()
+        keep = self.sink(o)
+        self.assertEqual([self.choose], o.dependencies)
+        assign(self.b, 5)
+        self.assertEqual([6], self.seen)
+
+    def test_exception(self):
+        @computed
+        def fail(x):
+            if ev(x) < 0:
+                raise ValueError(ev(x))
+            return ev(x)
+
+        x = var(-1)
+        f = fail(x)
+        with self.assertRaises(EvError):
+            ev(f)
+        self.assertEqual([x], f.dependencies)
+        assign(x, 1)
+        self.assertEqual(1, ev(f))
+
+    def test_used_by_reactive_functions(self):
+        double = reactive(lambda v: v * 2)(self.choose)
+        self.assertEqual(2, ev(double))
+        self.assertIsNotNone(double._inner._versioned_deps)
+        keep = self.sink(double)
+        assign(self.b, 3)
+        self.assertEqual([6], self.seen)
+
+    def test_reads_in_other_threads_are_not_dependencies(self):
+        other = var(10)
+        reading = threading.Event()
+        read_elsewhere = threading.Event()
+
+        @computed
+        def slow(b):
+            value = ev(b)
+            reading.set()
+            read_elsewhere.wait(5)
+            return value
+
+        def read_other():
+            reading.wait(5)
+            ev(other)
+            read_elsewhere.set()
+
+        thread = threading.Thread(target=read_other)
+        thread.start()
+        result = slow(self.b)
+        self.assertEqual(1, ev(result))
+        thread.join()
+        self.assertEqual([self.b], result.dependencies)
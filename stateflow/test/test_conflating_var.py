@@ -0,0 +1,91 @@
+import operator
+import unittest
+from unittest.mock import Mock
+
+from stateflow import Notifier, ev
+from stateflow.async_refresher import AsyncRefresher
+from stateflow.notifier import ACTIVE_NOTIFIER
+from stateflow.sync_refresher import UpdateTransaction
+from stateflow.var import ConflatingVar
+
+
+class ConflatingVarTests(unittest.TestCase):
+    def setUp(self):
+        self.cbk = Mock(return_value=True)
+        self.observer = Notifier(self.cbk)
+        self.observer.add_observer(ACTIVE_NOTIFIER)
+
+    def tearDown(self):
+        self.observer.remove_observer(ACTIVE_NOTIFIER)
+
+    def test_one_notification_per_transaction(self):
+        v = ConflatingVar(0)
+        v.__notifier__().add_observer(self.observer)
+        with UpdateTransaction():
+            v.__assign__(1)
+            v.__assign__(2)
+            v.__assign__(3)
+            self.assertTrue(v.pending)
+        self.cbk.assert_called_once()
+        self.assertFalse(v.pending)
+        self.assertEqual(2, v.conflated)
+        self.assertEqual(3, ev(v))
+
+    def test_reducer_accumulates_pending_values(self):
+        v = ConflatingVar(0, reducer=operator.add)
+        v.__notifier__().add_observer(self.observer)
+        with UpdateTransaction():
+            v.__assign__(1)
+            v.__assign__(2)
+            v.__assign__(3)
+        self.assertEqual(6, ev(v))
+
+        v.__assign__(4)  # previous value was consumed, so it's not accumulated
+        self.assertEqual(4, ev(v))
+
+    def test_reading_doesnt_consume_pending_batch(self):
+        v = ConflatingVar([], reducer=list.__add__)
+        v.__notifier__().add_observer(self.observer)
+        self.cbk.reset_mock()
+        with UpdateTransaction():
+            v.__assign__([1])
+            self.assertEqual([1], v.__eval__())
+            v.__assign__([2])
+            self.assertEqual([1, 2], v.__eval__())
+            self.assertTrue(v.pending)
+        self.cbk.assert_called_once()
+        self.assertEqual([1, 2], ev(v))
+        self.assertEqual(1, v._version)
+
+    def test_reading_returns_latest_value_before_refresh(self):
+        v = ConflatingVar(0)
+        with UpdateTransaction():
+            v.__assign__(5)
+            self.assertEqual(5, v.__eval__())
+
+    def test_inactive_var_schedules_once(self):
+        v = ConflatingVar(0)
+        v.__assign__(1)
+        v.__assign__(2)
+        self.assertTrue(v.pending)  # the refresher called it while inactive, so it's still pending
+        self.assertEqual(1, v.conflated)
+
+        v.__notifier__().add_observer(self.observer)
+        self.cbk.assert_called_once()
+        self.assertFalse(v.pending)
+        self.assertEqual(2, ev(v))
+
+
+class ConflatingVarAsyncRefresher(unittest.IsolatedAsyncioTestCase):
+    async def test_async_refresher_consumes_pending_value(self):
+        v = ConflatingVar(0)
+        v.__notifier__().add_observer(ACTIVE_NOTIFIER)
+        refresher = AsyncRefresher()
+        with UpdateTransaction():
+            v.__assign__(1)
+            v.__assign__(2)
+            refresher.schedule_call(v.__notifier__())
+            await refresher.task
+            self.assertFalse(v.pending)
+            self.assertEqual(2, v._value)
+        v.__notifier__().remove_observer(ACTIVE_NOTIFIER)
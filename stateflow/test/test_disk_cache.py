@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+import stateflow
+from stateflow import ev, reactive, var
+from stateflow.disk_cache import DiskCache
+
+calls = []
+
+
+def expensive(a, b):
+    calls.append((a, b))
+    return np.full(a, b)
+
+
+def describe(name, count):
+    calls.append(name)
+    return {'name': name, 'count': count}
+
+
+class DiskCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        calls.clear()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_result_is_reused_by_another_process(self):
+        f = reactive(disk_cache=self.dir.name)(expensive)
+        a = var(3)
+        res = f(a, 7)
+        assert_array_equal([7, 7, 7], ev(res))
+        self.assertEqual([(3, 7)], calls)
+
+        # simulate a restart: new decorated function and a new cache object
+        f2 = reactive(disk_cache=DiskCache(self.dir.name))(expensive)
+        res2 = f2(var(3), 7)
+        loaded = ev(res2)
+        assert_array_equal([7, 7, 7], loaded)
+        self.assertIsInstance(loaded, np.memmap)
+        self.assertEqual([(3, 7)], calls)
+        loaded[0] = 1  # writable like a computed result, but the cached file is not modified
+        assert_array_equal([7, 7, 7], ev(reactive(disk_cache=DiskCache(self.dir.name))(expensive)(var(3), 7)))
+
+        a @= 2
+        assert_array_equal([7, 7], ev(res))
+        self.assertEqual([(3, 7), (2, 7)], calls)
+
+    def test_plain_values_are_pickled(self):
+        cache = DiskCache(self.dir.name)
+        f = reactive(disk_cache=cache)(describe)
+        self.assertEqual({'name': 'x', 'count': 1}, f('x', 1))
+        self.assertEqual({'name': 'x', 'count': 1}, f('x', 1))
+        self.assertEqual(['x'], calls)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_least_recently_used_are_evicted(self):
+        cache = DiskCache(self.dir.name, max_bytes=2500)
+        f = reactive(disk_cache=cache)(expensive)
+        f(100, 1)  # 800 bytes + header each
+        f(100, 2)
+        f(100, 1)  # makes (100, 1) recently used
+        f(100, 3)
+        self.assertEqual(1, cache.evictions)
+        calls.clear()
+        f(100, 1)
+        f(100, 3)
+        self.assertEqual([], calls)
+        f(100, 2)
+        self.assertEqual([(100, 2)], calls)
+
+    def test_keys_of_equal_arguments_are_equal(self):
+        cache = DiskCache(self.dir.name)
+        key = cache.make_key(describe, [{'b': 1, 'a': {2, 1}}], {'count': [{'x', 'y'}]})
+        self.assertEqual(key, cache.make_key(describe, [{'a': {1, 2}, 'b': 1}], {'count': [{'y', 'x'}]}))
+        self.assertNotEqual(key, cache.make_key(describe, [{'a': {1, 2}, 'b': 2}], {'count': [{'y', 'x'}]}))
+        self.assertNotEqual(cache.make_key(describe, [{1, 2}], {}), cache.make_key(describe, [(1, 2)], {}))
+
+    def test_keys_dont_depend_on_hash_seed(self):
+        script = ('import sys; from stateflow.disk_cache import DiskCache; '
+                  'print(DiskCache(sys.argv[1]).make_key(print, [{"a", "b", "c", "d"}, {"k": frozenset("xyz")}], {}))')
+        keys = set()
+        for seed in ('1', '2', '3'):
+            env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=os.path.dirname(os.path.dirname(stateflow.__file__)))
+            keys.add(subprocess.check_output([sys.executable, '-c', script, self.dir.name], env=env))
+        self.assertEqual(1, len(keys))
+
+    def test_generators_are_not_supported(self):
+        def gen():
+            yield 1
+
+        with self.assertRaises(TypeError):
+            reactive(disk_cache=self.dir.name)(gen)
@@ -1,10 +1,13 @@
+import gc
 import unittest
+import weakref
 
 import pytest
 from numpy.testing import assert_array_equal
 
 from stateflow import ArgEvalError, const, ev, var
 from stateflow.errors import BodyEvalError
+from stateflow.scope import Scope
 
 
 class Forwarders(unittest.TestCase):
@@ -101,3 +104,53 @@ class Forwarders(unittest.TestCase):
 
         b @= 0
         self.assertEqual(ev(res), 1)
+
+
+class Config:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class InternedForwarders(unittest.TestCase):
+    def test_getattr_nodes_are_reused(self):
+        config = var(Config(section=Config(value=1)))
+        value = config.section.value
+        self.assertIs(config.section, config.section)
+        self.assertIs(value, config.section.value)
+        self.assertEqual(1, ev(value))
+
+        config @= Config(section=Config(value=2))
+        self.assertEqual(2, ev(value))
+        self.assertEqual(2, ev(config.section.value))
+
+    def test_getitem_nodes_are_reused_for_constant_keys(self):
+        d = var({'a': 1, 1: 'one', True: 'true'})
+        self.assertIs(d['a'], d['a'])
+        self.assertIsNot(d['a'], d[1])
+        self.assertIsNot(d[1], d[True])  # equal keys of different types are not mixed
+        key = var('a')
+        self.assertIsNot(d[key], d[key])  # reactive keys are not interned
+        self.assertIsNot(d[['a']], d[['a']])  # nor unhashable ones
+
+    def test_nodes_are_interned_per_scope(self):
+        config = var(Config(section=Config(value=1)))
+        outside = config.section.value
+        scope = Scope('panel')
+        with scope:
+            value = config.section.value
+            size = len(scope)
+            for _ in range(100):
+                self.assertEqual(1, ev(config.section.value))
+            self.assertIs(value, config.section.value)
+        self.assertEqual(size, len(scope))  # no nodes created after the first frame
+        self.assertIsNot(outside, value)
+        scope.dispose()
+        with Scope('another panel'):
+            self.assertIsNot(value, config.section.value)
+
+    def test_nodes_are_not_kept_alive(self):
+        v = var(Config(x=1))
+        ref = weakref.ref(v.x)
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(1, ev(v.x))
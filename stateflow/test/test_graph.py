@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import Mock
+
+from stateflow import assign, ev, var
+from stateflow.async_refresher import AsyncRefresher
+from stateflow.graph import Graph
+from stateflow.sync_refresher import get_default_refresher
+from stateflow.test import sink
+
+
+def graph_sink(graph, observable, callback):
+    """A `sink` bound to `graph`."""
+    with graph:
+        return sink(observable, callback)
+
+
+class GraphTests(unittest.TestCase):
+    def test_notifiers_are_bound_to_entered_graph(self):
+        graph = Graph('pricing')
+        with graph:
+            a = var(1)
+            b = a + 1
+        self.assertIs(graph, a.__notifier__().graph)
+        self.assertIs(graph.refresher, b.__notifier__().refresher)
+        self.assertIsNot(get_default_refresher(), graph.refresher)
+        self.assertIsNone(var(1).__notifier__().graph)
+
+        cbk = Mock()
+        keep = graph_sink(graph, a, cbk)
+        cbk.reset_mock()
+        assign(a, 2)
+        cbk.assert_called_once()
+        self.assertEqual(1, keep.calls)
+        self.assertEqual(3, ev(b))
+
+    def test_transaction_of_graph(self):
+        graph = Graph()
+        with graph:
+            a = var(1)
+        cbk = Mock()
+        keep = graph_sink(graph, a, cbk)
+        cbk.reset_mock()
+        with graph.transaction():
+            assign(a, 2)
+            assign(a, 3)
+            cbk.assert_not_called()
+        cbk.assert_called_once()
+
+    def test_partitions_refresh_independently_in_threads(self):
+        pricing, ui = Graph('pricing'), Graph('ui')
+        with pricing:
+            price = var(100)
+        with ui:
+            label = var('')
+        release = threading.Event()
+        ui_done = threading.Event()
+        seen = []
+
+        def on_price():
+            seen.append(('price', threading.get_ident(), ev(price)))
+            release.wait(5)  # a slow pricing update
+
+        def on_label():
+            seen.append(('label', threading.get_ident(), ev(label)))
+            if ev(label) == 'done':
+                ui_done.set()
+
+        keep = [graph_sink(pricing, price, on_price), graph_sink(ui, label, on_label),
+                graph_sink(ui, price, on_label)]
+        seen.clear()
+
+        stop = threading.Event()
+        threads = [threading.Thread(target=g.serve, args=(stop, 0.01)) for g in (pricing, ui)]
+        for t in threads:
+            t.start()
+        while pricing.thread_id is None or ui.thread_id is None:
+            stop.wait(0.001)
+        try:
+            pricing.call_soon(assign, price, 101)  # blocks the pricing thread until `release` is set
+            ui.call_soon(assign, label, 'done')
+            self.assertTrue(ui_done.wait(5))  # the ui partition is not blocked by pricing
+            release.set()
+        finally:
+            release.set()
+            stop.set()
+            for t in threads:
+                t.join()
+
+        threads_by_kind = {}
+        for kind, thread_id, _ in seen:
+            threads_by_kind.setdefault(kind, set()).add(thread_id)
+        self.assertEqual({pricing.thread_id}, threads_by_kind['price'])
+        self.assertEqual({ui.thread_id}, threads_by_kind['label'])
+        # the edge from the pricing var to the ui sink was passed to the ui thread
+        self.assertIn(('label', ui.thread_id, 'done'), seen)
+        self.assertEqual(2, len([s for s in seen if s[0] == 'label']))
+        self.assertGreater(ui.cross_thread_calls, 1)
+
+    def test_process_pending_is_bounded(self):
+        graph = Graph()
+        graph.thread_id = -1  # bound to another thread, so all calls are queued
+        calls = []
+
+        def call_again(i):
+            calls.append(i)
+            graph.call_soon(call_again, i + 1)  # sustained load
+
+        graph.call_soon(call_again, 0)
+        graph.call_soon(call_again, 100)
+        self.assertEqual(2, graph.process_pending())
+        self.assertEqual([0, 100], calls)
+        self.assertEqual(2, graph.pending())
+
+
+class AsyncGraphTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        refresher = AsyncRefresher()
+        refresher.collect_garbage = False
+        self.graph = Graph('async', refresher=refresher)
+        with self.graph:
+            self.a, self.b = var(1), var(2)
+        self.seen = []
+        self.keep = graph_sink(self.graph, [self.a, self.b], lambda: self.seen.append((ev(self.a), ev(self.b))))
+
+    async def wave_finished(self):
+        while self.graph.refresher.task is not None and not self.graph.refresher.task.done():
+            await self.graph.refresher.task
+
+    async def test_transaction(self):
+        with self.graph.transaction():
+            assign(self.a, 10)
+            await asyncio.sleep(0)  # the wave isn't started while the transaction is open
+            assign(self.b, 20)
+            self.assertTrue(self.graph.refresher.task is None or self.graph.refresher.task.done())
+        await self.wave_finished()
+        self.assertEqual([(10, 20)], self.seen)
+
+    async def test_process_pending(self):
+        self.graph.bind_thread()
+        producer = threading.Thread(target=lambda: [self.graph.call_soon(assign, self.a, 10),
+                                                    self.graph.call_soon(assign, self.b, 20)])
+        producer.start()
+        producer.join()
+        self.assertEqual(2, self.graph.process_pending())
+        await self.wave_finished()
+        self.assertEqual([(10, 20)], self.seen)
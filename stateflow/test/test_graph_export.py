@@ -0,0 +1,74 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from stateflow import Notifier, var
+from stateflow.graph_export import export_graph
+from stateflow.notifier import ACTIVE_NOTIFIER, dump_notifiers_to_dot
+
+
+def make_chain(length):
+    chain = [Notifier(name='n0')]
+    for i in range(1, length):
+        n = Notifier(name='n{}'.format(i))
+        chain[-1].add_observer(n)
+        chain.append(n)
+    return chain
+
+
+class GraphExport(unittest.TestCase):
+    def export_json(self, start, **kwargs):
+        f = io.StringIO()
+        export_graph(start, f, format='json', **kwargs)
+        return json.loads(f.getvalue())
+
+    def test_long_chain_without_recursion(self):
+        chain = make_chain(5000)
+        graph = self.export_json(chain[2500])
+        self.assertEqual(5000, len(graph['nodes']))
+        edges = {(e['source'], e['target']) for e in graph['edges']}
+        self.assertEqual(4999, len(graph['edges']))
+        self.assertEqual(4999, len(edges))
+
+    def test_depth_limit(self):
+        chain = make_chain(10)
+        graph = self.export_json(chain[5], max_depth=2)
+        self.assertEqual({'n3', 'n4', 'n5', 'n6', 'n7'}, {n['name'] for n in graph['nodes']})
+        self.assertEqual(4, len(graph['edges']))
+
+    def test_active_only_and_stats(self):
+        chain = make_chain(4)
+        chain[1].add_observer(ACTIVE_NOTIFIER)
+        try:
+            graph = self.export_json(chain[0], active_only=True, stats=True, max_depth=2)
+        finally:
+            chain[1].remove_observer(ACTIVE_NOTIFIER)
+        self.assertEqual({'n0', 'n1', 'ACTIVE'}, {n['name'] for n in graph['nodes']})
+        self.assertIn('calls', graph['nodes'][0])
+
+    def test_graphml(self):
+        a = var(1)
+        b = a + 1
+        f = io.StringIO()
+        export_graph(b, f, format='graphml', stats=True)
+        root = ET.fromstring(f.getvalue())
+        ns = {'g': 'http://graphml.graphdrawing.org/xmlns'}
+        self.assertEqual(3, len(root.findall('g:graph/g:node', ns)))
+        self.assertEqual(2, len(root.findall('g:graph/g:edge', ns)))
+
+    def test_dot(self):
+        chain = make_chain(3)
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, 'graph.dot')
+            dump_notifiers_to_dot(chain[0], filename)
+            with open(filename) as f:
+                dot = f.read()
+        self.assertTrue(dot.startswith('digraph'))
+        self.assertEqual(2, dot.count('->'))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_graph(Notifier(), io.StringIO(), format='svg')
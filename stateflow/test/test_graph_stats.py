@@ -0,0 +1,90 @@
+import unittest
+
+from stateflow import Notifier, computed, ev, reactive, select, var, volatile
+from stateflow.graph import Graph
+from stateflow.graph_stats import graph_stats, node_type, percentiles
+from stateflow.var import Cache, ConflatingVar
+
+
+class GraphStatsTests(unittest.TestCase):
+    def test_percentiles(self):
+        self.assertEqual({'p50': 0, 'p90': 0, 'p99': 0, 'p100': 0}, percentiles([]))
+        self.assertEqual({'p50': 50, 'p90': 90, 'p99': 99, 'p100': 100}, percentiles(range(100, 0, -1)))
+        self.assertEqual({'p50': 1, 'p100': 2}, percentiles([1, 2, 1], ranks=(50, 100)))
+
+    def test_stats_of_connected_graph(self):
+        @reactive
+        def add(x, y):
+            return x + y
+
+        a, b = var(1), var(2)
+        s = add(a, b)
+        c = Cache(add(s, a))
+        self.assertEqual(4, ev(c))
+
+        stats = graph_stats(c)
+        # results of reactive functions are cached: a, b -> add -> Cache -> add -> Cache -> c
+        self.assertEqual(7, stats['nodes'])
+        self.assertEqual(7, stats['edges'])
+        self.assertEqual({0: 2, 1: 1, 2: 1, 3: 1, 4: 1, 5: 1}, stats['priority_histogram'])
+        self.assertEqual(2, stats['fan_in']['p100'])
+        self.assertEqual(2, stats['fan_out']['p100'])
+        self.assertEqual(1, stats['fan_out']['p50'])
+        self.assertEqual(0.0, stats['active_fraction'])
+        self.assertEqual({'Var': 2, 'CallResult': 2, 'Cache': 3},
+                         {name: type_stats['count'] for name, type_stats in stats['types'].items()})
+        self.assertTrue(all(type_stats['bytes'] > 0 for type_stats in stats['types'].values()))
+        self.assertEqual(sum(type_stats['bytes'] for type_stats in stats['types'].values()), stats['bytes'])
+        self.assertEqual(0, stats['queue_length'])
+
+        self.assertEqual(3, graph_stats(a, max_depth=1)['nodes'])  # a and both calls
+
+    def test_active_and_pending_nodes(self):
+        source = Notifier(name='source')
+        middle = Notifier(lambda: True, name='middle')
+        source.add_observer(middle)
+        observer = Notifier(lambda: True, name='observer')
+        middle.add_observer(observer)
+        self.assertEqual(0, graph_stats(source)['active'])
+        source.notify()
+        self.assertEqual(1, graph_stats(source)['pending'])  # source was notified, but it's inactive
+
+        forced = Notifier(lambda: True, forced_active=True)
+        middle.add_observer(forced)
+        stats = graph_stats(source)
+        self.assertEqual(3, stats['active'])
+        self.assertEqual(0, stats['pending'])  # middle was called when activated
+        self.assertAlmostEqual(3 / 4, stats['active_fraction'])
+        self.assertEqual('Notifier', node_type(observer))
+
+    def test_disconnected_active_graphs(self):
+        a = var(1)
+        first = volatile(a + 1)
+        alone = graph_stats(a)
+        others = [volatile(var(i) + 1) for i in range(10)]
+        stats = graph_stats(a)
+        self.assertEqual(alone['nodes'], stats['nodes'])
+        self.assertEqual(5, stats['nodes'])  # a, the call, its cache, the volatile proxy and the shared ACTIVE_NOTIFIER
+
+    def test_types_of_nodes(self):
+        @computed
+        def total(config):
+            return ev(config)['a'] + 1
+
+        config = ConflatingVar({'a': 1})
+        nodes = [config, total(config), select(config, 'a')]
+        self.assertEqual(['ConflatingVar', 'Computed', 'Selector'], [node_type(n.__notifier__()) for n in nodes])
+        self.assertEqual('Notifier', node_type(Notifier()))
+
+    def test_stats_of_partition(self):
+        graph = Graph('pricing')
+        with graph:
+            a = var(1)
+            b = Notifier(name='b')
+            a.__notifier__().add_observer(b)
+        unbound = Notifier(name='unbound')
+        b.add_observer(unbound)
+        stats = graph_stats(graph)
+        self.assertEqual(2, stats['nodes'])
+        self.assertEqual(1, stats['edges'])  # the edge to the unbound notifier is not counted
+        self.assertEqual(3, graph_stats(a)['nodes'])
@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# import times are measured by benchmarks/bench_import.py; here only what gets imported is checked
+
+
+def run_python(code):
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+class LazyImport(unittest.TestCase):
+    def test_import_is_lazy(self):
+        result = run_python(
+            "import json, sys\n"
+            "import stateflow\n"
+            "print(json.dumps([m for m in sys.modules if m.startswith('stateflow')]))\n")
+        self.assertEqual(['stateflow'], result)
+
+    def test_first_use(self):
+        result = run_python(
+            "import json, sys\n"
+            "from stateflow import ev, var\n"
+            "a = var(1)\n"
+            "assert ev(a + 1) == 2\n"
+            "a @= 2\n"
+            "assert ev(a + 1) == 3\n"
+            "print(json.dumps(list(sys.modules)))\n")
+        self.assertNotIn('asyncio', result)
+        self.assertNotIn('typing_extensions', result)
+
+    def test_var_is_the_function(self):
+        result = run_python(
+            "import json\n"
+            "import stateflow.var\n"
+            "from stateflow import var\n"
+            "print(json.dumps(callable(var) and var.__module__))\n")
+        self.assertEqual('stateflow.utils', result)
@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+from stateflow import Notifier, ev, reactive, var, volatile
+from stateflow.async_refresher import AsyncRefresher
+from stateflow.graph import Graph
+from stateflow.ingest import BLOCK, CONFLATE, DROP, ingest
+from stateflow.test import sink
+
+
+async def numbers(n):
+    for i in range(n):
+        yield i
+
+
+async def recorded_numbers(n, events):
+    for i in range(n):
+        events.append(('pull', i))
+        yield i
+
+
+async def failing_source():
+    yield 1
+    raise ValueError("source failed")
+
+
+class SlowSink(Notifier):
+    """Its call takes a few iterations of the event loop (the asynchronous refresher awaits it)."""
+
+    def call(self):
+        async def finish():
+            for _ in range(5):
+                await asyncio.sleep(0)
+            self.notify_func()
+
+        return finish()
+
+
+class Ingest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.v = var(None)
+        self.mock = Mock()
+        self.sink = volatile(reactive(self.mock)(self.v))
+        self.mock.reset_mock()
+
+    def seen(self):
+        return [call.args[0] for call in self.mock.call_args_list]
+
+    async def test_block_delivers_everything_in_order(self):
+        ingestion = await ingest(numbers(10), self.v, maxsize=2, policy=BLOCK)
+        self.assertEqual(list(range(10)), self.seen())
+        self.assertEqual(10, ingestion.assigned)
+        self.assertEqual(0, ingestion.dropped)
+
+    async def test_drop_keeps_newest(self):
+        ingestion = await ingest(numbers(10), self.v, maxsize=2, policy=DROP)
+        self.assertEqual([8, 9], self.seen())
+        self.assertEqual(8, ingestion.dropped)
+
+    async def test_conflate_keeps_oldest_and_latest(self):
+        ingestion = await ingest(numbers(10), self.v, maxsize=2, policy=CONFLATE)
+        self.assertEqual([0, 9], self.seen())
+        self.assertEqual(8, ingestion.conflated)
+        self.assertEqual(9, ev(self.v))
+
+    async def test_source_exception_is_propagated(self):
+        with self.assertRaises(ValueError):
+            await ingest(failing_source(), self.v)
+        self.assertEqual([1], self.seen())
+
+    def assert_backpressure(self, events, n):
+        for i in range(n - 3):
+            # at most one item is buffered and one held by the blocked reader while the wave of an item runs
+            self.assertLess(events.index(('wave', i)), events.index(('pull', i + 3)))
+
+    async def test_backpressure(self):
+        events = []
+        keep = sink(self.v, lambda: events.append(('wave', ev(self.v))))
+        await ingest(recorded_numbers(8, events), self.v, maxsize=1)
+        self.assert_backpressure(events, 8)
+
+    async def test_backpressure_with_async_refresher(self):
+        refresher = AsyncRefresher()
+        refresher.collect_garbage = False
+        with Graph('ingest', refresher=refresher):
+            v = var(None)
+            events = []
+            slow_sink = SlowSink(lambda: events.append(('wave', ev(v))), forced_active=True)
+        v.__notifier__().add_observer(slow_sink)
+        await ingest(recorded_numbers(8, events), v, maxsize=1)
+        self.assert_backpressure(events, 8)
+        self.assertEqual(('wave', 7), events[-1])
+
+    async def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            await ingest(numbers(1), self.v, policy='fast')
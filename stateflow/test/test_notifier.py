@@ -1,11 +1,18 @@
+import gc
+import threading
 import unittest
 from unittest.mock import Mock
 
-from stateflow import Notifier
-from stateflow.notifier import ACTIVE_NOTIFIER
+from stateflow import Notifier, reactive, var, volatile
+from stateflow.notifier import ACTIVE_NOTIFIER, _tick, disable_registry, enable_registry, get_registry
 from stateflow.sync_refresher import UpdateTransaction
 
 
+@reactive
+def my_inc(a):
+    return a + 1
+
+
 class NotifierTests(unittest.TestCase):
     def setUp(self):
         self.cbk = Mock(return_value=True)
@@ -91,3 +98,137 @@ class TwoNotifiersTests(unittest.TestCase):
         self._notifier1.notify()
         self.cbk1.assert_called_once()
         self.cbk2.assert_not_called()
+
+
+class BulkActivationTests(unittest.TestCase):
+    def make_chain(self, length):
+        chain = [Notifier(name='n0')]
+        for i in range(1, length):
+            n = Notifier(name='n{}'.format(i))
+            chain[-1].add_observer(n)
+            chain.append(n)
+        return chain
+
+    def setUp(self):
+        self.sink = Notifier(forced_active=True, name='sink')
+
+    def test_long_chain_is_activated_and_deactivated(self):
+        chain = self.make_chain(5000)
+        chain[-1].add_observer(self.sink)  # would exceed the recursion limit if done recursively
+        self.assertTrue(all(n.active for n in chain))
+        chain[-1].remove_observer(self.sink)
+        self.assertFalse(any(n.active for n in chain))
+        self.assertEqual(0, sum(len(n._active_observers) for n in chain))
+
+    def test_deep_chain_is_refreshed_without_recursion(self):
+        chain = self.make_chain(5000)
+        chain[-1].add_observer(self.sink)
+        chain[0].notify()
+        self.assertEqual([1] * len(chain), [n.calls for n in chain])
+
+    def test_pending_notifiers_are_called_in_one_wave(self):
+        chain = self.make_chain(50)
+        marked = chain[::10]
+        for n in marked:
+            n.notify()  # notified when inactive, so it's pending until activated
+        self.assertEqual([0] * len(marked), [n.calls for n in marked])
+        self.assertTrue(all(n._called_when_inactive for n in marked))
+        chain[-1].add_observer(self.sink)
+        # every notifier is called once after activation (not once per pending notifier upstream)
+        self.assertEqual([1] * len(chain), [n.calls for n in chain])
+        self.assertFalse(any(n._called_when_inactive for n in chain))
+
+
+class InactiveObserversTests(unittest.TestCase):
+    def setUp(self):
+        self.hot = Notifier(name='hot')
+        self.hot.add_observer(ACTIVE_NOTIFIER)
+        self.cbk = Mock(return_value=True)
+        self.observer = Notifier(self.cbk, name='observer')
+        self.hot.add_observer(self.observer)
+        self.inactive = [Notifier(name='inactive{}'.format(i)) for i in range(1000)]
+        for n in self.inactive:
+            self.hot.add_observer(n)
+
+    def tearDown(self):
+        self.hot.remove_observer(ACTIVE_NOTIFIER)
+
+    def test_inactive_observers_are_not_queued(self):
+        self.hot.notify()
+        self.assertEqual(1, self.hot.calls)
+        self.assertEqual(0, sum(n.calls for n in self.inactive))
+        self.assertFalse(any(n._called_when_inactive for n in self.inactive))
+        self.cbk.assert_not_called()
+
+    def test_missed_changes_are_caught_up(self):
+        self.hot.notify()
+        self.cbk.assert_not_called()
+        self.observer.add_observer(ACTIVE_NOTIFIER)
+        try:
+            self.cbk.assert_called_once()  # it missed the change when inactive
+            self.hot.notify()
+            self.assertEqual(2, self.cbk.call_count)
+        finally:
+            self.observer.remove_observer(ACTIVE_NOTIFIER)
+
+        self.observer.add_observer(ACTIVE_NOTIFIER)  # nothing changed in the meantime
+        self.observer.remove_observer(ACTIVE_NOTIFIER)
+        self.assertEqual(2, self.cbk.call_count)
+
+    def test_missed_changes_are_caught_up_transitively(self):
+        cbk = Mock(return_value=True)
+        second = Notifier(cbk, name='second')
+        self.observer.add_observer(second)
+        self.hot.notify()
+        second.add_observer(ACTIVE_NOTIFIER)
+        try:
+            self.cbk.assert_called_once()
+            cbk.assert_called_once()
+        finally:
+            second.remove_observer(ACTIVE_NOTIFIER)
+
+    def test_clock_ticks_are_unique_across_threads(self):
+        ticks = []
+
+        def tick_many():
+            ticks.extend([_tick() for _ in range(10000)])
+
+        threads = [threading.Thread(target=tick_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(40000, len(set(ticks)))
+
+
+class RegistryTests(unittest.TestCase):
+    def tearDown(self):
+        disable_registry()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_registry())
+
+    def test_indexes(self):
+        before = Notifier(name='before')
+        registry = enable_registry()
+        self.assertIs(registry, enable_registry())
+
+        a = var(1)
+        res = my_inc(a)
+        a.__notifier__().name = 'a'
+        self.assertNotIn(before, registry)
+        self.assertEqual([a.__notifier__()], registry.by_name('a'))
+        self.assertEqual(1, len(registry.by_owner(my_inc)))
+        self.assertIs(my_inc, registry.owner(registry.by_owner(my_inc)[0]))
+        self.assertEqual(3, len(registry))
+        self.assertEqual([], registry.active())
+
+        sink = volatile(res)
+        self.assertIn(a.__notifier__(), registry.active())
+        self.assertIn(a.__notifier__(), registry.index_by_name()['a'])
+
+    def test_notifiers_are_not_kept_alive(self):
+        registry = enable_registry()
+        Notifier(name='temporary')
+        gc.collect()
+        self.assertEqual([], registry.by_name('temporary'))
@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+from stateflow import assign, debounce, ev, reactive, throttle, var, volatile
+
+
+class Debounce(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.a = var(0)
+        self.mock = Mock()
+        self.debounced = debounce(self.a, 20)
+        self.sink = volatile(reactive(self.mock)(self.debounced))
+        self.mock.assert_called_once_with(0)
+        self.mock.reset_mock()
+
+    async def test_burst_is_delivered_once(self):
+        for i in range(1, 6):
+            assign(self.a, i)
+        self.mock.assert_not_called()
+
+        await asyncio.sleep(0.06)
+        self.mock.assert_called_once_with(5)
+        self.assertEqual(5, self.debounced.received)
+        self.assertEqual(1, self.debounced.emitted)
+        self.assertEqual(4, self.debounced.dropped)
+
+    async def test_value_is_always_latest(self):
+        assign(self.a, 7)
+        self.assertEqual(7, ev(self.debounced))
+
+
+class Throttle(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.a = var(0)
+        self.mock = Mock()
+        self.throttled = throttle(self.a, 500)
+        self.sink = volatile(reactive(self.mock)(self.throttled))
+        self.mock.reset_mock()
+
+    async def test_first_immediately_rest_at_the_end_of_interval(self):
+        assign(self.a, 1)
+        self.mock.assert_called_once_with(1)
+        self.mock.reset_mock()
+
+        assign(self.a, 2)
+        assign(self.a, 3)
+        assign(self.a, 4)
+        self.mock.assert_not_called()
+        self.assertTrue(self.throttled.pending)
+
+        await asyncio.sleep(0.7)
+        self.mock.assert_called_once_with(4)
+        self.assertEqual(2, self.throttled.emitted)
+        self.assertEqual(2, self.throttled.dropped)
+
+    def test_without_loop_notifications_are_not_delayed(self):
+        assign(self.a, 1)
+        assign(self.a, 2)
+        self.assertEqual(2, self.mock.call_count)
+        self.assertEqual(0, self.throttled.dropped)
@@ -0,0 +1,117 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from stateflow import assign, ev, reactive, var
+from stateflow.replay import MAGIC, Recorder, Replayer, read_log
+from stateflow.var import ConflatingVar
+from stateflow.test import sink
+
+
+class RecordReplayTests(unittest.TestCase):
+    def test_record_and_replay(self):
+        price, qty, other = var(0), var(0), var(0)
+        log = io.BytesIO()
+        with Recorder(log, {'price': price, 'qty': qty}) as recorder:
+            assign(price, 10)
+            assign(qty, 2)
+            assign(other, 5)  # not recorded
+            assign(price, 11)
+        assign(price, 12)  # not recorded either
+        self.assertEqual(3, recorder.records)
+        self.assertTrue(log.getvalue().startswith(MAGIC))
+
+        log.seek(0)
+        self.assertEqual([('price', 10), ('qty', 2), ('price', 11)],
+                         [(name, value) for _, name, value in read_log(log)])
+
+        # a fresh graph
+        new_price, new_qty = var(0), var(0)
+        total = reactive(lambda p, q: p * q)(new_price, new_qty)
+        calls = []
+        keep = sink(total, lambda: calls.append(ev(total)))
+        ev(total)  # observers of a cache are notified only after it was read
+        log.seek(0)
+        report = Replayer(log).replay({'price': new_price, 'qty': new_qty})
+        self.assertEqual([0, 20, 22], calls)
+        stats = report.stats()
+        self.assertEqual(3, stats['waves'])
+        self.assertEqual(0, stats['missing'])
+        self.assertGreaterEqual(stats['p100'], stats['p50'])
+
+        log.seek(0)
+        report = Replayer(log).replay({'price': new_price})
+        self.assertEqual({'qty': 1}, report.missing)
+
+    def test_sessions_appended_to_file(self):
+        a, b = var(0), ConflatingVar(0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'assignments.log')
+            with Recorder(path, {'a': a}):
+                assign(a, 1)
+            with Recorder(path, {'b': b, 'a': a}):  # different node ids
+                assign(a, 2)
+                assign(b, 3)
+            self.assertEqual([('a', 1), ('a', 2), ('b', 3)], [(name, value) for _, name, value in read_log(path)])
+
+    def test_recorded_pace(self):
+        a = var(0)
+        log = io.BytesIO()
+        with Recorder(log, {'a': a}):
+            assign(a, 1)
+            time.sleep(0.05)
+            assign(a, 2)
+        log.seek(0)
+        self.assertGreaterEqual(Replayer(log).replay({'a': var(0)}, speed=1.0).duration, 0.04)
+        log.seek(0)
+        self.assertLess(Replayer(log).replay({'a': var(0)}, speed=10.0).duration, 0.04)
+
+    def test_custom_encoding_and_unencodable_values(self):
+        a = var(0)
+        blobs = {}
+
+        def encode(value):
+            key = str(len(blobs)).encode()
+            blobs[key] = value
+            return key
+
+        log = io.BytesIO()
+        with Recorder(log, {'a': a}, encode=encode):
+            assign(a, object())
+        log.seek(0)
+        [(_, _, value)] = list(read_log(log, decode=blobs.__getitem__))
+        self.assertIs(ev(a), value)
+
+        log = io.BytesIO()
+        with Recorder(log, {'a': a}) as recorder:
+            assign(a, lambda: None)  # can't be pickled
+        self.assertEqual(1, recorder.skipped)
+        self.assertEqual(0, recorder.records)
+
+    def test_recording_errors_dont_break_assignments(self):
+        class FailingLog(io.BytesIO):
+            def write(self, data):
+                if self.tell() > 0:
+                    raise OSError('disk full')
+                return super().write(data)
+
+        a = var(0)
+        observed = []
+        keep = sink(a, lambda: observed.append(ev(a)))
+        with Recorder(FailingLog(), {'a': a}) as recorder:
+            with self.assertLogs('replay', 'ERROR'):
+                assign(a, 1)
+        self.assertEqual([1], observed)
+        self.assertEqual(1, recorder.errors)
+        self.assertEqual(0, recorder.records)
+
+    def test_many_node_ids(self):
+        a = var(0)
+        log = io.BytesIO()
+        with Recorder(log, {'a': a}) as recorder:
+            recorder._node_ids.update(('other {}'.format(i), i) for i in range(70000))
+            assign(a, 1)
+        log.seek(0)
+        self.assertEqual([('a', 1)], [(name, value) for _, name, value in read_log(log)])
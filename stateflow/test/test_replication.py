@@ -0,0 +1,98 @@
+import datetime
+import pickle
+import socket
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from stateflow import assign, ev, var
+from stateflow.replication import Publisher, Replica, restricted_loads
+from stateflow.sync_refresher import UpdateTransaction
+from stateflow.test import sink
+
+
+class ReplicationTests(unittest.TestCase):
+    def setUp(self):
+        self.publisher_socket, self.replica_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def tearDown(self):
+        self.publisher_socket.close()
+        self.replica_socket.close()
+
+    def test_waves_are_replicated(self):
+        config = var({'rate': 1})
+        prices = var(np.zeros(100000))
+        unset = var()
+        publisher = Publisher({'config': config, 'prices': prices, 'unset': unset}, self.publisher_socket)
+        publisher.start()
+        replica = Replica(self.replica_socket, {'prices': var()})
+        self.assertTrue(replica.receive())
+        self.assertEqual({'rate': 1}, ev(replica.vars['config']))
+        assert_array_equal(np.zeros(100000), ev(replica.vars['prices']))
+        self.assertNotIn('unset', replica.vars)
+
+        cbk = Mock()
+        keep = sink(list(replica.vars.values()), cbk)
+        cbk.reset_mock()
+
+        new_prices = np.zeros(100000)
+        new_prices[[5, 500, 50000]] = [1.5, 2.5, 3.5]
+        with UpdateTransaction():
+            assign(config, {'rate': 2})
+            assign(config, {'rate': 3})
+            assign(prices, new_prices)
+        self.assertEqual(2, publisher.waves)
+        self.assertEqual(4, publisher.values_sent)
+        self.assertLess(publisher.bytes_sent, 16000)  # 1% of the raw size: zeros and a sparse delta compress well
+
+        self.assertTrue(replica.receive())
+        cbk.assert_called_once()
+        self.assertEqual({'rate': 3}, ev(replica.vars['config']))
+        assert_array_equal(new_prices, ev(replica.vars['prices']))
+        self.assertEqual(1, replica.last_wave)
+
+        assign(prices, np.arange(3, dtype=np.int8))  # another shape and dtype
+        self.assertTrue(replica.receive())
+        assert_array_equal([0, 1, 2], ev(replica.vars['prices']))
+        self.assertEqual(np.int8, ev(replica.vars['prices']).dtype)
+
+        publisher.stop()
+        assign(config, {'rate': 4})
+        self.assertEqual(3, publisher.waves)
+        self.publisher_socket.close()
+        self.assertFalse(replica.receive())
+        self.assertEqual(3, replica.waves)
+
+    def test_slow_peer_doesnt_block_waves(self):
+        noise = np.random.default_rng(0)
+        prices = var(noise.random(100000))
+        publisher = Publisher({'prices': prices}, self.publisher_socket)
+        publisher.start()
+        values = [noise.random(100000) for _ in range(3)]
+        for value in values:
+            assign(prices, value)  # incompressible, much more than fits into the socket buffer
+        self.assertEqual(4, publisher.waves)
+        self.assertGreater(publisher.pending_frames(), 0)
+
+        replica = Replica(self.replica_socket)
+        for _ in range(4):
+            self.assertTrue(replica.receive())
+        assert_array_equal(values[-1], ev(replica.vars['prices']))
+        publisher.stop()
+        self.assertEqual(0, publisher.pending_frames())
+        self.assertIsNone(publisher.error)
+
+    def test_only_plain_data_is_unpickled_by_default(self):
+        value = {'when': datetime.date(2020, 1, 2), 'rates': [1.5, 2j], 'tags': {'a'}}
+        self.assertEqual(value, restricted_loads(pickle.dumps(value)))
+        with self.assertRaises(pickle.UnpicklingError):
+            restricted_loads(pickle.dumps(Mock))
+
+        publisher = Publisher({'config': var(value)}, self.publisher_socket)
+        publisher.start()
+        replica = Replica(self.replica_socket)
+        self.assertTrue(replica.receive())
+        self.assertEqual(value, ev(replica.vars['config']))
+        publisher.stop()
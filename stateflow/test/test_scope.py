@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import Mock
+
+from stateflow import assign, ev, reactive, var, volatile
+from stateflow.scope import Scope
+
+
+class ScopeTests(unittest.TestCase):
+    def setUp(self):
+        self.inside = 0
+        self.mock = Mock()
+
+    @reactive
+    def acquire(self, a):
+        self.inside += 1
+        self.mock(a)
+        yield a * 2
+        self.inside -= 1
+
+    def test_dispose_detaches_and_finalizes(self):
+        a = var(1)
+        with Scope('panel') as scope:
+            res = self.acquire(a)
+            sink = volatile(res)
+        self.assertTrue(a.__notifier__().active)
+        self.assertEqual(1, self.inside)
+        self.assertGreater(len(scope), 0)
+
+        scope.dispose()
+        self.assertFalse(a.__notifier__().active)
+        self.assertEqual(0, self.inside)
+        self.assertEqual(0, len(scope))
+        self.assertEqual([], list(a.__notifier__()._observers))
+
+        self.mock.reset_mock()
+        assign(a, 2)
+        self.mock.assert_not_called()
+
+    def test_outer_graph_keeps_working(self):
+        a = var(1)
+        outer = volatile(a + 1)
+        with Scope() as scope:
+            inner = volatile(a * 10)
+        scope.dispose()
+        self.assertTrue(a.__notifier__().active)
+        assign(a, 5)
+        self.assertEqual(6, ev(outer))
+
+    def test_nested_scopes(self):
+        with Scope() as outer:
+            a = var(1)
+            with Scope() as inner:
+                b = var(2)
+        inner.dispose()
+        self.assertGreater(len(outer), 0)
+        with self.assertRaises(RuntimeError):
+            with inner:
+                pass
+        outer.dispose()
+        self.assertTrue(outer.disposed)
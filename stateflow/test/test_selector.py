@@ -0,0 +1,98 @@
+import unittest
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from stateflow import EvError, assign, ev, reactive, select, var
+from stateflow.test import sink
+
+
+@dataclass(frozen=True)
+class Settings:
+    theme: str
+    size: int
+
+
+class SelectorTests(unittest.TestCase):
+    def sink(self, observable, seen):
+        n = sink(observable, lambda: seen.append(ev(observable)))
+        ev(observable)  # observers are notified about changes of values that were read
+        return n
+
+    def test_notifies_only_when_selected_part_changes(self):
+        state = var({'user': 'ann', 'count': 0})
+        user = select(state, 'user')
+        seen = []
+        keep = self.sink(user, seen)
+
+        assign(state, {'user': 'ann', 'count': 1})
+        self.assertEqual([], seen)
+        assign(state, {'user': 'bob', 'count': 1})
+        self.assertEqual(['bob'], seen)
+        self.assertEqual(1, user._version)
+
+    def test_attributes_functions_and_eq(self):
+        settings = var(Settings('dark', 10))
+        theme = select(settings, 'theme')
+        size = select(settings, lambda s: s.size / 10, eq=lambda a, b: abs(a - b) < 0.5)
+        themes, sizes = [], []
+        keep = [self.sink(theme, themes), self.sink(size, sizes)]
+        assign(settings, replace(ev(settings), size=12))
+        assign(settings, replace(ev(settings), size=20))
+        assign(settings, replace(ev(settings), theme='light'))
+        self.assertEqual(['light'], themes)
+        self.assertEqual([2.0], sizes)
+
+    def test_arrays_are_compared_as_changed(self):
+        state = var({'a': np.zeros(3)})
+        a = select(state, 'a')
+        seen = []
+        keep = self.sink(a, seen)
+        assign(state, {'a': np.zeros(3)})
+        self.assertEqual(1, len(seen))
+        b = select(state, 'a', eq=np.array_equal)
+        keep2 = self.sink(b, seen)
+        seen.clear()
+        assign(state, {'a': np.zeros(3)})
+        self.assertEqual(1, len(seen))  # only `a`
+
+    def test_errors_and_inactive_reads(self):
+        state = var({'a': 1})
+        b = select(state, 'b')
+        with self.assertRaises(EvError):
+            ev(reactive(lambda x: x)(b))
+        a = select(state, 'a')
+        self.assertEqual(1, ev(a))
+        assign(state, {'a': 2})
+        self.assertEqual(2, ev(a))  # not active, so computed on reads
+        self.assertEqual(3, ev(a + 1))
+
+    def test_same_error_is_not_a_change(self):
+        state = var({'a': 1})
+        b = select(state, 'b')
+        notified = []
+        keep = sink(b, lambda: notified.append(b._exception))
+        with self.assertRaises(KeyError):
+            ev(b)
+        assign(state, {'a': 2})
+        assign(state, {'a': 3})
+        self.assertEqual([], notified)  # KeyError('b') each time
+        assign(state, {'b': 1})
+        assign(state, {'a': 4})
+        self.assertEqual([None, KeyError], [e if e is None else type(e) for e in notified])
+
+    def test_selectors_are_shared(self):
+        state = var({'a': 1})
+        self.assertIs(select(state, 'a'), select(state, 'a'))
+        self.assertIsNot(select(state, 'a'), select(state, 'a', eq=lambda x, y: False))
+
+    def test_many_selectors_of_one_source(self):
+        state = var({i: 0 for i in range(2000)})
+        selectors = [select(state, i) for i in range(2000)]
+        seen = []
+        keep = [self.sink(s, seen) for s in selectors]
+        value = dict(ev(state))
+        value[7] = 1
+        assign(state, value)
+        self.assertEqual([1], seen)
+        self.assertEqual(2000 * 2, sum(s.projections for s in selectors))  # read once, then projected once
@@ -0,0 +1,98 @@
+import multiprocessing
+import select
+import sys
+import unittest
+from multiprocessing import resource_tracker
+from unittest import mock
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from stateflow import ev
+from stateflow.shared_var import _SEQUENCE, SharedVar
+from stateflow.test import sink
+
+
+def wait_and_poll(shared, timeout=5.0):
+    select.select([shared], [], [], timeout)
+    return shared.poll()
+
+
+def worker(name, ready, results):
+    shared = SharedVar.attach(name)
+    seen = []
+    keep = sink(shared, lambda: seen.append(float(ev(shared).sum())))
+    seen.clear()
+    ready.set()
+    if wait_and_poll(shared):
+        results.put(seen)
+        shared.__assign__(ev(shared) * 2)
+    shared.close()
+
+
+class SharedVarTests(unittest.TestCase):
+    def test_same_process(self):
+        a = SharedVar.create(np.zeros((2, 3)))
+        b = SharedVar.attach(a.name)
+        try:
+            calls = []
+            keep = sink(b, lambda: calls.append(ev(b)[1, 2]))
+            calls.clear()
+
+            a.__assign__(np.arange(6).reshape(2, 3))
+            self.assertEqual(2, a.sequence)
+            self.assertEqual([], calls)
+            self.assertTrue(wait_and_poll(b))
+            self.assertEqual([5.0], calls)
+            self.assertFalse(b.poll())
+            assert_array_equal(np.arange(6).reshape(2, 3), b.read())
+            with self.assertRaises(ValueError):
+                ev(b)[0, 0] = 1  # read-only view
+        finally:
+            b.close()
+            a.close()
+
+    def test_another_process(self):
+        ctx = multiprocessing.get_context('spawn')
+        shared = SharedVar.create(np.ones(1000, dtype=np.float32))
+        try:
+            ready = ctx.Event()
+            results = ctx.Queue()
+            process = ctx.Process(target=worker, args=(shared.name, ready, results))
+            process.start()
+            self.assertTrue(ready.wait(30))
+            shared.__assign__(np.full(1000, 3, dtype=np.float32))
+            self.assertEqual([3000.0], results.get(timeout=10))
+            self.assertTrue(wait_and_poll(shared))
+            self.assertEqual(6000.0, float(ev(shared).sum()))
+            process.join(10)
+            self.assertEqual(0, process.exitcode)
+        finally:
+            shared.close()
+
+    def test_objects_are_not_supported(self):
+        with self.assertRaises(TypeError):
+            SharedVar.create(np.array([object()]))
+
+    def test_read_gives_up_on_unfinished_write(self):
+        shared = SharedVar.create(np.zeros(3))
+        try:
+            _SEQUENCE.pack_into(shared._block.buf, 0, 1)  # as if a writer died during a write
+            with self.assertRaises(TimeoutError):
+                shared.read(timeout=0.01)
+            _SEQUENCE.pack_into(shared._block.buf, 0, 2)
+            assert_array_equal(np.zeros(3), shared.read())
+        finally:
+            shared.close()
+
+    @unittest.skipIf(sys.version_info >= (3, 13), "attached blocks are not tracked at all")
+    def test_attached_block_is_not_tracked(self):
+        shared = SharedVar.create(np.zeros(3))
+        try:
+            with mock.patch('stateflow.shared_var.resource_tracker.unregister', wraps=resource_tracker.unregister) \
+                    as unregister:
+                attached = SharedVar.attach(shared.name)
+            attached.close()
+            unregister.assert_called_once_with(attached._block._name, 'shared_memory')
+        finally:
+            shared.close()
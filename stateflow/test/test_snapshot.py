@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from stateflow import EvError, ev, reactive, var
+from stateflow.snapshot import restore, snapshot
+
+
+class Snapshot(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'graph.snap')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def build(self):
+        mock = Mock()
+
+        @reactive
+        def scaled(data, factor):
+            mock()
+            return data * factor
+
+        data = var()
+        factor = var()
+        result = scaled(data, factor)
+        return {'data': data, 'factor': factor, 'result': result}, mock
+
+    def test_restored_cache_is_not_recomputed(self):
+        nodes, mock = self.build()
+        nodes['data'] @= np.arange(6, dtype=np.float32).reshape(2, 3)
+        nodes['factor'] @= 2
+        expected = ev(nodes['result'])
+        self.assertEqual({'data', 'factor', 'result'}, set(snapshot(nodes, self.path)))
+
+        nodes, mock = self.build()
+        self.assertEqual({'data', 'factor', 'result'}, set(restore(nodes, self.path)))
+        assert_array_equal(expected, ev(nodes['result']))
+        self.assertIsInstance(ev(nodes['data']), np.memmap)
+        mock.assert_not_called()
+
+        nodes['factor'] @= 3
+        assert_array_equal(expected / 2 * 3, ev(nodes['result']))
+        mock.assert_called_once()
+
+    def test_invalid_cache_is_skipped(self):
+        nodes, mock = self.build()
+        nodes['data'] @= np.zeros(0)
+        nodes['factor'] @= 1
+        self.assertEqual({'data', 'factor'}, set(snapshot(nodes, self.path)))
+
+        nodes, mock = self.build()
+        restore(nodes, self.path)
+        self.assertEqual((0,), ev(nodes['result']).shape)
+        mock.assert_called_once()
+
+    def test_initialized_var_is_assigned(self):
+        a = var(5)
+        snapshot({'a': a}, self.path)
+        b = var(1)
+        doubled = b * 2
+        self.assertEqual(2, ev(doubled))
+        restore({'a': b}, self.path)
+        self.assertEqual(10, ev(doubled))
+
+    def test_dependents_evaluated_before_restore_are_invalidated(self):
+        snapshot({'a': var(5)}, self.path)
+        b = var()
+        r = b + 1
+        with self.assertRaises(EvError):
+            ev(r)
+        restore({'a': b}, self.path)
+        self.assertEqual(6, ev(r))
+
+    def test_restored_cache_evaluated_before_restore_is_not_recomputed(self):
+        nodes, mock = self.build()
+        nodes['data'] @= np.ones(3)
+        nodes['factor'] @= 2
+        ev(nodes['result'])
+        self.assertIn('result', snapshot(nodes, self.path))
+
+        nodes, mock = self.build()
+        with self.assertRaises(EvError):
+            ev(nodes['result'])
+        mock.reset_mock()
+        restore(nodes, self.path)
+        assert_array_equal([2, 2, 2], ev(nodes['result']))
+        mock.assert_not_called()
+
+    def test_unsupported_node(self):
+        with self.assertRaises(TypeError):
+            snapshot({'a': object()}, self.path)
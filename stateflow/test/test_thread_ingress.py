@@ -0,0 +1,73 @@
+import threading
+import unittest
+from collections import deque
+from unittest.mock import Mock
+
+from stateflow import Notifier, ev, var
+from stateflow.notifier import ACTIVE_NOTIFIER
+from stateflow.thread_ingress import AssignmentQueue
+
+PRODUCERS = 16
+ASSIGNMENTS = 2000
+
+
+class AssignmentQueueTests(unittest.TestCase):
+    def test_coalesces_repeated_assignments(self):
+        queue = AssignmentQueue()
+        a = var(0)
+        cbk = Mock(return_value=True)
+        observer = Notifier(cbk)
+        observer.add_observer(ACTIVE_NOTIFIER)
+        a.__notifier__().add_observer(observer)
+        try:
+            for i in range(1, 4):
+                queue.assign(a, i)
+            self.assertEqual(1, queue.drain())
+        finally:
+            observer.remove_observer(ACTIVE_NOTIFIER)
+        cbk.assert_called_once()
+        self.assertEqual(3, ev(a))
+        self.assertEqual(2, queue.coalesced)
+        self.assertEqual(0, queue.drain())
+
+    def test_drain_is_bounded_under_sustained_load(self):
+        queue = AssignmentQueue()
+        a = var(0)
+
+        class Flooded(deque):
+            def popleft(self):
+                self.append((a, -1))  # a producer appends whenever an item is taken
+                return super().popleft()
+
+        queue._queue = Flooded([(a, 1), (a, 2)])
+        self.assertEqual(1, queue.drain())
+        self.assertEqual(2, ev(a))
+        self.assertEqual(2, queue.assignments)
+        self.assertEqual(2, queue.pending())
+
+    def test_stress_many_producers(self):
+        queue = AssignmentQueue(batch_window=0.001)
+        own_vars = [var(None) for _ in range(PRODUCERS)]
+        shared = var(None)
+        stop = threading.Event()
+        consumer = threading.Thread(target=queue.serve, args=(stop, 0.01))
+        consumer.start()
+
+        def produce(index):
+            for i in range(ASSIGNMENTS):
+                queue.assign(own_vars[index], i)
+                queue.assign(shared, (index, i))
+
+        producers = [threading.Thread(target=produce, args=(index,)) for index in range(PRODUCERS)]
+        for t in producers:
+            t.start()
+        for t in producers:
+            t.join()
+        stop.set()
+        consumer.join()
+
+        self.assertEqual(2 * PRODUCERS * ASSIGNMENTS, queue.assignments)
+        self.assertEqual(0, queue.pending())
+        self.assertEqual([ASSIGNMENTS - 1] * PRODUCERS, [ev(v) for v in own_vars])
+        self.assertEqual(ASSIGNMENTS - 1, ev(shared)[1])
+        self.assertGreater(queue.coalesced, 0)
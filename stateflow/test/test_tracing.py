@@ -0,0 +1,70 @@
+import unittest
+
+from stateflow import Notifier
+from stateflow.tracing import LoggingSubscriber, Subscriber, subscribe, unsubscribe
+
+
+class Recorder(Subscriber):
+    def __init__(self):
+        self.events = []
+
+    def on_schedule(self, notifier):
+        self.events.append(('schedule', notifier.name))
+
+    def on_skip(self, notifier):
+        self.events.append(('skip', notifier.name))
+
+    def on_call_begin(self, notifier):
+        self.events.append(('begin', notifier.name))
+
+    def on_call_end(self, notifier, exception):
+        self.events.append(('end', notifier.name, exception))
+
+    def on_wave_begin(self, refresher):
+        self.events.append(('wave_begin',))
+
+    def on_wave_end(self, refresher):
+        self.events.append(('wave_end',))
+
+
+def fail():
+    raise ValueError('boo')
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self):
+        self.source = Notifier(name='source')
+        self.failing = Notifier(fail, name='failing')
+        self.sink = Notifier(forced_active=True, name='sink')
+        self.source.add_observer(self.failing)
+        self.failing.add_observer(self.sink)
+        self.inactive = Notifier(name='inactive')
+
+    def test_events(self):
+        recorder = subscribe(Recorder())
+        try:
+            self.source.notify()
+            self.inactive.notify()
+        finally:
+            unsubscribe(recorder)
+        self.assertEqual(('schedule', 'source'), recorder.events[0])
+        self.assertEqual(('wave_begin',), recorder.events[1])
+        self.assertEqual(('begin', 'source'), recorder.events[2])
+        self.assertIn(('schedule', 'failing'), recorder.events)
+        failing_end = [e for e in recorder.events if e[:2] == ('end', 'failing')]
+        self.assertIsInstance(failing_end[0][2], ValueError)
+        self.assertEqual(('wave_end',), recorder.events[-2])
+        self.assertEqual(('skip', 'inactive'), recorder.events[-1])
+
+        count = len(recorder.events)
+        self.source.notify()
+        self.assertEqual(count, len(recorder.events))  # not subscribed anymore
+
+    def test_logging_subscriber(self):
+        subscriber = subscribe(LoggingSubscriber())
+        try:
+            with self.assertLogs('refresher', level='DEBUG') as logs:
+                self.source.notify()
+        finally:
+            unsubscribe(subscriber)
+        self.assertTrue(any('call notification' in line and 'source' in line for line in logs.output))
@@ -0,0 +1,101 @@
+import gc
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from stateflow import assign, ev, reactive, var
+from stateflow.sync_refresher import UpdateTransaction, get_default_refresher
+from stateflow.versioned import VersionStore
+
+
+class VersionStoreTests(unittest.TestCase):
+    def test_epochs_are_published_after_waves(self):
+        a = var(1)
+        b = a * 10
+        store = VersionStore([a, b])
+        first = store.latest
+        self.assertEqual((1, 10), (store.snapshot_read(a), store.snapshot_read(b)))
+
+        with UpdateTransaction():
+            assign(a, 2)
+            self.assertIs(first, store.latest)  # the wave is not finished
+        self.assertEqual(first.number + 1, store.latest.number)
+        self.assertEqual((2, 20), (store.snapshot_read(a), store.snapshot_read(b)))
+        self.assertEqual(10, store.snapshot_read(b, first))  # old epochs don't change
+
+        with self.assertRaises(KeyError):
+            store.snapshot_read(var(1))
+        store.untrack(b)
+        self.assertNotIn(b, store.latest)
+        assign(a, 3)
+        self.assertEqual(3, store.snapshot_read(a))
+
+    def test_reading_doesnt_evaluate(self):
+        calls = []
+
+        @reactive
+        def square(x):
+            calls.append(threading.get_ident())
+            return x * x
+
+        a = var(3)
+        sq = square(a)
+        store = VersionStore([sq])
+        calls.clear()
+        result = []
+        reader = threading.Thread(target=lambda: result.append(store.snapshot_read(sq)))
+        reader.start()
+        reader.join()
+        self.assertEqual([9], result)
+        self.assertEqual([], calls)
+
+    def test_consistent_reads_during_waves(self):
+        a = var(0)
+        b = a + 1
+        c = reactive(lambda x, y: x + y)(a, b)
+        store = VersionStore([a, b, c])
+        stop = threading.Event()
+        errors = []
+        reads = [0]
+
+        def reader():
+            while not stop.is_set():
+                epoch = store.latest
+                x, y, z = (store.snapshot_read(node, epoch) for node in (a, b, c))
+                if y != x + 1 or z != x + y:
+                    errors.append((epoch.number, x, y, z))
+                reads[0] += 1
+                time.sleep(0.0001)
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)  # readers run in the middle of waves
+        for t in threads:
+            t.start()
+        try:
+            with patch.object(get_default_refresher(), 'collect_garbage', False):  # makes waves much faster
+                for i in range(1, 500):
+                    assign(a, i)
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual([], errors)
+        self.assertGreater(reads[0], 0)
+        self.assertEqual(499 * 2 + 1, ev(c))
+        self.assertEqual(499 * 2 + 1, store.snapshot_read(c))
+
+    def test_old_epochs_are_freed(self):
+        a = var(0)
+        store = VersionStore([a])
+        held = store.latest
+        for i in range(1, 10):
+            assign(a, i)
+        gc.collect()
+        self.assertEqual([held.number, store.latest.number], store.live_epochs())
+        del held
+        gc.collect()
+        self.assertEqual([store.latest.number], store.live_epochs())
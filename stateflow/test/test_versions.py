@@ -0,0 +1,85 @@
+import unittest
+
+from stateflow import assign, ev, reactive, var, volatile
+from stateflow.cache_manager import disable_cache_manager, enable_cache_manager
+from stateflow.var import ConflatingVar
+from stateflow.test import sink
+
+
+class VersionTests(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        @reactive
+        def add(x, y):
+            self.calls.append((x, y))
+            return x + y
+
+        self.add = add
+
+    def sink(self, observable):
+        n = sink(observable, lambda: ev(observable))
+        ev(observable)
+        return n
+
+    def test_versions_of_vars_and_caches(self):
+        a = var(1)
+        s = self.add(a, 1)
+        keep = self.sink(s)
+        self.assertEqual((0, 0), (a._version, s._version))
+        assign(a, 2)
+        self.assertEqual((1, 1), (a._version, s._version))
+        c = ConflatingVar(0)
+        assign(c, 1)
+        assign(c, 2)
+        ev(c)
+        self.assertEqual(1, c._version)  # conflated into one change
+
+    def test_diamond(self):
+        a = var(1)
+        left, right = self.add(a, 1), self.add(a, 2)
+        top = self.add(left, right)
+        keep = self.sink(top)
+        self.calls.clear()
+        assign(a, 2)
+        self.assertEqual(7, ev(top))
+        self.assertEqual([(2, 1), (2, 2), (3, 4)], sorted(self.calls))
+
+        self.calls.clear()
+        right.__notifier__().notify()  # no argument of right has a new version, so its value is kept
+        self.assertEqual(7, ev(top))
+        self.assertEqual([], self.calls)
+        self.assertEqual(1, right.skipped_invalidations)
+
+    def test_notification_after_mutation_is_a_new_version(self):
+        items = var([1])
+        total = reactive(lambda xs: sum(xs))(items)
+        seen = []
+        keep = sink(total, lambda: seen.append(ev(total)))
+        self.assertEqual(1, ev(total))
+        ev(items).append(2)
+        items.__notifier__().notify()
+        self.assertEqual([3], seen)
+        self.assertEqual(1, items._version)
+        self.assertEqual(0, total.skipped_invalidations)
+
+    def test_evicted_value_is_recomputed(self):
+        manager = enable_cache_manager(max_bytes=1)
+        try:
+            a = var(1)
+            s = self.add(a, 1)
+            self.assertEqual(2, ev(s))
+            self.assertEqual(3, ev(self.add(a, 2)))  # evicts s
+            self.assertTrue(s._evicted)
+            self.calls.clear()
+            self.assertEqual(2, ev(s))
+            self.assertEqual([(1, 1)], self.calls)
+        finally:
+            disable_cache_manager()
+
+    def test_not_versioned_dependencies(self):
+        a = var(1)
+        self.assertIsNotNone(self.add(a, 1)._inner._versioned_deps)
+        self.assertIsNone(reactive(pass_args=['x'])(lambda x: x)(a)._inner._versioned_deps)
+        self.assertIsNone(reactive(other_deps=[var()])(lambda x: x)(a)._inner._versioned_deps)
+        self.assertIsNone(self.add(a, volatile(a))._inner._versioned_deps)  # the proxy doesn't keep a version
@@ -0,0 +1,30 @@
+import unittest
+
+from stateflow import assign, var
+from stateflow.sync_refresher import UpdateTransaction
+from stateflow.wave_collector import WaveCollector
+
+
+class WaveCollectorTests(unittest.TestCase):
+    def test_changes_are_flushed_once_per_wave(self):
+        flushed = []
+        collector = WaveCollector(flushed.append, name='test')
+        a, b, c = var(1), var(2), var(3)
+        for key, node in [('a', a), ('b', b), ('c', c)]:
+            collector.add(key, node)
+        self.assertIn('a', collector)
+
+        with UpdateTransaction():
+            assign(b, 20)
+            assign(a, 10)
+            assign(b, 21)
+        self.assertEqual([['b', 'a']], flushed)
+
+        collector.remove('b')
+        assign(b, 22)
+        assign(c, 30)
+        self.assertEqual([['b', 'a'], ['c']], flushed)
+
+        collector.clear()
+        assign(c, 31)
+        self.assertEqual(2, len(flushed))
@@ -0,0 +1,76 @@
+"""
+Assigning `Var`s from many threads while the graph is refreshed in one (consumer) thread.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from stateflow.common import Observable, T
+from stateflow.sync_refresher import UpdateTransaction
+
+
+class AssignmentQueue:
+    """
+    A thread-safe ingress for assignments. Producer threads call `assign()`, which only appends to a queue (no lock is
+    taken, unless the consumer has to be woken up). The consumer thread (the one that runs the refresher) calls
+    `drain()` or `serve()`, which applies queued assignments in batches: repeated assignments to the same `Var` are
+    coalesced into the last one and the whole batch is applied in one `UpdateTransaction`.
+
+    `batch_window` (in seconds) is the latency vs. batching knob: `serve()` waits that long after being woken up, so
+    assignments arriving in the meantime are applied in the same batch.
+    """
+
+    def __init__(self, batch_window: float = 0.0):
+        self.batch_window = batch_window
+        self.assignments = 0  # received by the consumer
+        self.coalesced = 0  # skipped since a later value for the same var was in the same batch
+        self.batches = 0
+        self._queue = deque()
+        self._wakeup = threading.Event()
+
+    def assign(self, var: Observable[T], value: T):
+        """Queue an assignment; may be called from any thread."""
+        self._queue.append((var, value))
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def drain(self) -> int:
+        """
+        Apply assignments queued before the call; must be called from the consumer thread. Returns the number of vars
+        set. Assignments queued meanwhile are left for the next call, so the graph is refreshed under sustained load.
+        """
+        self._wakeup.clear()  # before draining, so an assignment queued meanwhile wakes the consumer again
+        batch = {}
+        queue = self._queue
+        received = len(queue)
+        for _ in range(received):
+            var, value = queue.popleft()
+            batch[id(var)] = (var, value)
+        if not batch:
+            return 0
+        self.assignments += received
+        self.coalesced += received - len(batch)
+        with UpdateTransaction():
+            for var, value in batch.values():
+                var.__assign__(value)
+        self.batches += 1
+        return len(batch)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until there is something to drain (or the timeout passes)."""
+        return self._wakeup.wait(timeout)
+
+    def serve(self, stop: threading.Event, poll_interval: float = 0.1):
+        """Drain the queue in the current thread until `stop` is set (then drain it the last time)."""
+        while not stop.is_set():
+            if self.wait(poll_interval):
+                if self.batch_window:
+                    time.sleep(self.batch_window)
+                self.drain()
+        while self._queue:
+            self.drain()
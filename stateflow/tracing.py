@@ -0,0 +1,89 @@
+"""
+Hooks for tracing notifications and refresh waves.
+
+Notifiers and refreshers report events to subscribers in `active_subscribers`. When the list is empty (the default)
+the cost is one check of the list per event, so tracing can stay in the hot paths.
+"""
+
+import logging
+from typing import List, Optional
+
+
+class Subscriber:
+    """
+    A base class for subscribers: override the methods of interesting events and pass the subscriber to `subscribe`.
+
+    Events:
+        on_schedule: A call of an active `notifier` was scheduled in a refresher.
+        on_skip: An inactive `notifier` was notified (or called); it's called when activated.
+        on_call_begin, on_call_end: A refresher calls `notifier`; `exception` is the one raised by the call (if any).
+        on_wave_begin, on_wave_end: A refresher starts (or finishes) processing its queue; waves may be nested.
+        on_assign: `value` is assigned to `var` (a `Var`), before its observers are notified.
+    """
+
+    def on_schedule(self, notifier):
+        pass
+
+    def on_skip(self, notifier):
+        pass
+
+    def on_call_begin(self, notifier):
+        pass
+
+    def on_call_end(self, notifier, exception: Optional[Exception]):
+        pass
+
+    def on_wave_begin(self, refresher):
+        pass
+
+    def on_wave_end(self, refresher):
+        pass
+
+    def on_assign(self, var, value):
+        pass
+
+
+active_subscribers = []  # type: List[Subscriber]
+
+
+def subscribe(subscriber: Subscriber) -> Subscriber:
+    active_subscribers.append(subscriber)
+    return subscriber
+
+
+def unsubscribe(subscriber: Subscriber):
+    active_subscribers.remove(subscriber)
+
+
+class LoggingSubscriber(Subscriber):
+    """Logs events with DEBUG level (it's what refreshers used to log)."""
+
+    def __init__(self, logger: logging.Logger = None):
+        self.logger = logger or logging.getLogger('refresher')
+        self._called = []  # notifiers called in each (nested) wave
+
+    def on_schedule(self, notifier):
+        self.logger.debug('  scheduled notification (%d) [%X] %s', notifier.priority, id(notifier), notifier.name)
+
+    def on_skip(self, notifier):
+        self.logger.debug('  skipped inactive notifier (%d) [%X] %s', notifier.priority, id(notifier), notifier.name)
+
+    def on_call_begin(self, notifier):
+        if self._called:
+            if notifier in self._called[-1]:
+                self.logger.debug('notifier [%X] %s called more than once', id(notifier), notifier.name)
+            self._called[-1].add(notifier)
+        self.logger.debug('call notification (%d) [%X] %s', notifier.priority, id(notifier), notifier.name)
+
+    def on_call_end(self, notifier, exception: Optional[Exception]):
+        if exception is not None:
+            self.logger.debug('notifier [%X] %s raised %r', id(notifier), notifier.name, exception)
+
+    def on_wave_begin(self, refresher):
+        self._called.append(set())
+        self.logger.debug('wave started')
+
+    def on_wave_end(self, refresher):
+        if self._called:
+            self._called.pop()
+        self.logger.debug('wave finished')
@@ -1,9 +1,14 @@
 from abc import abstractmethod
+from typing import Callable, Optional
 
+from stateflow import cache_manager
+from stateflow.call_result import SyncCallResult
 from stateflow.common import Observable, T, assign, is_observable
 from stateflow.errors import FinalizedError, NotInitializedError
 from stateflow.forwarders import ConstForwarders, MutatingForwarders
 from stateflow.notifier import DummyNotifier, Notifier
+from stateflow.scope import active_scopes
+from stateflow.tracing import active_subscribers
 
 
 class NotInitialized:
@@ -21,6 +26,7 @@ class Const(Observable[T], ConstForwarders):
     repr_name = 'Const'
 
     dummy_notifier = DummyNotifier(priority=0)
+    _version = 0
 
     def __init__(self, value: T):
         super().__init__()
@@ -30,7 +36,7 @@ class Const(Observable[T], ConstForwarders):
         return self.dummy_notifier
 
     def __eval__(self) -> T:
-        if self._value == FINALIZED:
+        if self._value is FINALIZED:
             raise FinalizedError()
         return self._value
 
@@ -72,7 +78,7 @@ class NotifiedProxy(Proxy[T]):
 
     def __init__(self, inner: Observable[T]):
         super().__init__(inner)
-        self._notifier = Notifier(self._notify)
+        self._notifier = Notifier(self._notify, owner=self)
         self._inner.__notifier__().add_observer(self._notifier)
 
     def __notifier__(self):
@@ -88,8 +94,8 @@ class VarProxy(NotifiedProxy[T]):
     the inner `Observable` notifies or when another `Observable` is assigned.
     """
 
-    def __init__(self, inner=Const(None)):
-        super().__init__(inner)
+    def __init__(self, inner: Observable[T] = None):
+        super().__init__(inner if inner is not None else Const(None))
 
     def set_inner(self, inner: Observable[T]):
         assert is_observable(inner)
@@ -116,28 +122,96 @@ class Var(Observable[T], ConstForwarders, MutatingForwarders):
     def __init__(self, value: T = NOT_INITIALIZED):
         super().__init__()
         self._value = value  # type: T
-        self._notifier = Notifier()
+        self._version = 0  # increased whenever the notifier is called, also by an explicit `notify()` after a mutation
+        self._notifier = Notifier(self._notified, owner=self)
         self._notifier.name = f'Var[{type(value).__name__}]'
+        if active_scopes:
+            active_scopes[-1].own_observable(self)
 
     def __notifier__(self) -> Notifier:
         return self._notifier
 
     def __eval__(self) -> T:
-        if self._value == NOT_INITIALIZED:
+        if self._value is NOT_INITIALIZED:
             raise NotInitializedError()
-        elif self._value == FINALIZED:
+        elif self._value is FINALIZED:
             raise FinalizedError()
         return self._value
 
     def __assign__(self, value):
+        if active_subscribers:
+            for subscriber in active_subscribers:
+                subscriber.on_assign(self, value)
         self._value = value
         self._notifier.notify()
 
+    def _notified(self) -> bool:
+        self._version += 1
+        return True
+
     def __finalize__(self):
         self._value = FINALIZED
         # no notification here since this value should not be used anymore
 
 
+class ConflatingVar(Var[T]):
+    """
+    A `Var` for sources that are assigned faster than the graph is refreshed. Only one notification is scheduled until
+    the refresher calls it; assignments made in the meantime are merged into the pending value (the latest one wins,
+    unless a `reducer` is given).
+
+    Arguments:
+        reducer: A function `reducer(pending, new) -> pending` used for accumulating sources (e.g. `operator.add` for
+                 counters or `list.__add__` for appended batches).
+    """
+
+    repr_name = 'ConflatingVar'
+
+    def __init__(self, value: T = NOT_INITIALIZED, reducer: Optional[Callable[[T, T], T]] = None):
+        super().__init__(value)
+        self._reducer = reducer
+        self._pending_value = NOT_INITIALIZED
+        self._scheduled = False
+        self.conflated = 0
+        self._notifier.notify_func = self._consume
+        self._notifier.name = f'ConflatingVar[{type(value).__name__}]'
+
+    @property
+    def pending(self) -> bool:
+        """Whether a notification was scheduled but not consumed by the refresher yet."""
+        return self._scheduled
+
+    def __eval__(self) -> T:
+        # the pending value is not consumed here: further assignments are merged into it until the refresher calls
+        # the notifier, so dependents get the whole batch
+        if self._pending_value is not NOT_INITIALIZED:
+            return self._pending_value
+        return super().__eval__()
+
+    def __assign__(self, value):
+        if active_subscribers:
+            for subscriber in active_subscribers:
+                subscriber.on_assign(self, value)
+        if self._pending_value is not NOT_INITIALIZED and self._reducer is not None:
+            value = self._reducer(self._pending_value, value)
+        self._pending_value = value
+        if self._scheduled:
+            self.conflated += 1
+        else:
+            self._scheduled = True
+            self._notifier.notify()
+
+    def _apply_pending(self):
+        if self._pending_value is not NOT_INITIALIZED:
+            self._value = self._pending_value
+            self._pending_value = NOT_INITIALIZED
+
+    def _consume(self):
+        self._scheduled = False
+        self._apply_pending()
+        return self._notified()
+
+
 class CacheBase(Observable[T], ConstForwarders):
     """
     See `Cache` for description.
@@ -149,20 +223,43 @@ class CacheBase(Observable[T], ConstForwarders):
         self._cache_is_valid = False
         self._cached_value = None
         self._cached_exception = None
-        self._notifier = Notifier(self._invalidate_cache)
+        self._evicted = False  # the value was dropped by the cache manager (but it's still up to date)
+        self._version = 0  # increased whenever the inner observable notifies (not when the value is evicted)
+        self.skipped_invalidations = 0
+        self._notifier = Notifier(self._invalidate_cache, owner=self)
         self._inner.__notifier__().add_observer(self._notifier)
         self._notifier.name = f'Cache'
+        if active_scopes:
+            active_scopes[-1].own_observable(self)
 
     def __notifier__(self):
         return self._notifier
 
     def _invalidate_cache(self):
+        if isinstance(self._inner, SyncCallResult) and self._inner.is_up_to_date():
+            # notified, but no argument has a new version: the function would return the same value
+            self.skipped_invalidations += 1
+            return False
+        self._version += 1
+        if self._evicted:
+            # dependents may have read the value before it was evicted
+            self._evicted = False
+            return True
         if not self._cache_is_valid:
             # we don't forward the notification if new value was not requested (with eval) since last invalidate
             return False
         self._cache_is_valid = False
+        self._cached_value = None
+        if cache_manager.manager is not None:
+            cache_manager.manager.discard(self)
         return True
 
+    def _evict(self):
+        """Drop the value without notifying dependents; it's recomputed on the next read."""
+        self._cache_is_valid = False
+        self._cached_value = None
+        self._evicted = True
+
     @abstractmethod
     def __eval__(self) -> T:
         pass
@@ -177,20 +274,29 @@ class Cache(CacheBase[T]):
     """
 
     def __eval__(self):
-        self._update_cache()
+        recomputed = self._update_cache()
         if self._cached_exception:
             raise self._cached_exception
-        return self._cached_value
+        value = self._cached_value
+        if cache_manager.manager is not None:
+            cache_manager.manager.read(self, value, recomputed)  # may evict this value, so it's read before
+        return value
 
-    def _update_cache(self):
-        if not self._cache_is_valid:
-            try:
-                self._cached_value = self._inner.__eval__()
-                self._cached_exception = None
-            except Exception as e:
-                self._cached_value = None
-                self._cached_exception = e
-            self._cache_is_valid = True
+    def _update_cache(self) -> bool:
+        if self._cache_is_valid:
+            return False
+        if self._evicted:
+            self._evicted = False
+            if cache_manager.manager is not None:
+                cache_manager.manager.recomputations += 1
+        try:
+            self._cached_value = self._inner.__eval__()
+            self._cached_exception = None
+        except Exception as e:
+            self._cached_value = None
+            self._cached_exception = e
+        self._cache_is_valid = True
+        return True
 
 
 # class AsyncCache(CacheBase[T], ConstForwarders):
@@ -0,0 +1,113 @@
+"""
+Consistent reads of values of the graph from other threads.
+
+A `VersionStore` follows selected nodes. After each wave that changed any of them it publishes an `Epoch`: an
+immutable snapshot of their values. Publishing is a single reference assignment, so readers in other threads don't
+take any locks; they read committed values only (never a half-updated state of a running wave) and never trigger an
+evaluation or a refresh. An old epoch is freed as soon as no reader holds it.
+"""
+
+import logging
+import weakref
+from typing import Dict, Iterable, List, Optional
+
+from stateflow.common import Observable, ev
+from stateflow.errors import EvError, FinalizedError, NotInitializedError
+from stateflow.wave_collector import WaveCollector
+
+logger = logging.getLogger('versioned')
+
+
+class Epoch:
+    """
+    Values of the followed nodes after the wave number `number` (epochs are numbered consecutively). Values are shared,
+    not copied: they shouldn't be mutated in place after being assigned.
+    """
+
+    __slots__ = ('number', '_values', '__weakref__')
+
+    def __init__(self, number: int, values: Dict[int, object]):
+        self.number = number
+        self._values = values  # from ids of nodes; never modified after publishing
+
+    def __repr__(self):
+        return "<Epoch {} ({} values)>".format(self.number, len(self._values))
+
+    def __contains__(self, node: Observable) -> bool:
+        return id(node) in self._values
+
+    def read(self, node: Observable):
+        try:
+            return self._values[id(node)]
+        except KeyError:
+            raise KeyError("{!r} has no value in the epoch {}".format(node, self.number)) from None
+
+
+class VersionStore:
+    """
+    Publishes epochs of values of `nodes` (and nodes added with `track`). The store has to be created and modified in
+    the thread that refreshes the nodes; `latest` and `snapshot_read` can be used from any thread.
+
+    A node that can't be evaluated keeps its previous value in new epochs (or has none).
+    """
+
+    def __init__(self, nodes: Iterable[Observable] = ()):
+        self._nodes = {}  # type: Dict[int, Observable]
+        self._collector = WaveCollector(self._publish_changed, name='version of')
+        self._epochs = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary  # living ones, by numbers
+        self._latest = None  # type: Optional[Epoch]
+        self._publish({})
+        for node in nodes:
+            self.track(node)
+
+    @property
+    def latest(self) -> Epoch:
+        return self._latest
+
+    def snapshot_read(self, node: Observable, epoch: Optional[Epoch] = None):
+        """
+        The value of `node` committed in `epoch` (the latest one by default). To read several nodes consistently, get
+        `latest` once and pass it to each read.
+        """
+        return (epoch if epoch is not None else self._latest).read(node)
+
+    def live_epochs(self) -> List[int]:
+        """Numbers of epochs that were not freed yet (the latest one and ones held by readers)."""
+        return sorted(self._epochs.keys())
+
+    def track(self, node: Observable):
+        """Follow `node` (it's kept active); a new epoch with its current value is published."""
+        key = id(node)
+        if key in self._nodes:
+            return
+        self._nodes[key] = node
+        self._collector.add(key, node)
+        self._collector.mark(key)
+        self._collector.flush()
+
+    def untrack(self, node: Observable):
+        """Stop following `node`; it's not in new epochs."""
+        key = id(node)
+        self._collector.remove(key)
+        del self._nodes[key]
+        values = dict(self._latest._values)
+        values.pop(key, None)
+        self._publish(values)
+
+    def _publish_changed(self, changed: List[int]):
+        values = dict(self._latest._values)  # copied on write, published epochs are immutable
+        for key in changed:
+            node = self._nodes.get(key)
+            if node is None:
+                continue
+            try:
+                values[key] = ev(node)
+            except (EvError, NotInitializedError, FinalizedError):
+                logger.debug('no new version of %r, it has no valid value', node)
+        self._publish(values)
+
+    def _publish(self, values: Dict[int, object]):
+        number = self._latest.number + 1 if self._latest is not None else 0
+        epoch = Epoch(number, values)
+        self._epochs[number] = epoch
+        self._latest = epoch  # atomic for readers
@@ -0,0 +1,54 @@
+"""
+Collecting nodes that changed during a refresh wave, to handle them all at once after the wave.
+"""
+
+from functools import partial
+from typing import Callable, Dict, Hashable, List, Tuple
+
+from stateflow.common import Observable
+from stateflow.notifier import Notifier
+
+
+class WaveCollector:
+    """
+    Follows nodes added with `add` (they are kept active). Each node notifying in a wave is marked by its own collector
+    notifier; the flusher observes all collectors, so the refresher calls it after them and `flush` gets the keys of
+    the changed nodes (each one once, in the order of their first notification) once per wave.
+    """
+
+    def __init__(self, flush: Callable[[List[Hashable]], None], name: str = ''):
+        self._flush_changed = flush
+        self._name = name
+        self._changed = []  # type: List[Hashable]
+        self._collectors = {}  # type: Dict[Hashable, Tuple[Observable, Notifier]]
+        self._flusher = Notifier(self.flush, forced_active=True, name='{} flush'.format(name))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._collectors
+
+    def add(self, key: Hashable, node: Observable):
+        collector = Notifier(partial(self.mark, key), name='{} {}'.format(self._name, node.__notifier__().name))
+        node.__notifier__().add_observer(collector)
+        collector.add_observer(self._flusher)
+        self._collectors[key] = (node, collector)
+
+    def remove(self, key: Hashable):
+        node, collector = self._collectors.pop(key)
+        node.__notifier__().remove_observer(collector)
+        collector.remove_observer(self._flusher)
+
+    def clear(self):
+        for key in list(self._collectors):
+            self.remove(key)
+
+    def mark(self, key: Hashable) -> bool:
+        """Mark the node as changed (it's passed to the next flush)."""
+        self._changed.append(key)
+        return True
+
+    def flush(self) -> bool:
+        """Pass the marked keys to `flush` (if there are any); called by the refresher after the collectors."""
+        changed, self._changed = list(dict.fromkeys(self._changed)), []
+        if changed:
+            self._flush_changed(changed)
+        return False
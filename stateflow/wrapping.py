@@ -1,8 +1,11 @@
+import weakref
 from typing import Any, Callable, Iterable, Sequence, Tuple
 
 from stateflow import reactive
-from stateflow.common import ev
+from stateflow.common import ev, is_observable
+from stateflow.graph import active_graphs
 from stateflow.notifier import Notifier
+from stateflow.scope import active_scopes
 
 
 def get_subnotifier(self: Notifier, name: str) -> Notifier:
@@ -59,19 +62,49 @@ def forward_by_name(name):
     return func
 
 
-def add_reactive_forwarders(cl: Any, functions: Iterable[Tuple[str, Callable]]):
+def interned_forwarder(source, name: str, key, make: Callable[[], Any]):
     """
-    For operators and methods that don't modify a state of an object (__neg_, etc.).
+    Return the node created by `make()` for the same `source`, forwarder `name` and `key` before, if it's still alive
+    (e.g. so `config.section.value` in a loop doesn't create new nodes each time). Nodes are held weakly, in the
+    `__dict__` of `source`. Keys that are observables or are not hashable are not interned. Nodes are interned
+    separately for each graph and scope (a node created inside a `Scope` is disposed with it).
+    """
+    if is_observable(key):
+        return make()
+    intern_key = (name, type(key), key, active_graphs[-1] if active_graphs else None,
+                  active_scopes[-1] if active_scopes else None)
+    try:
+        hash(intern_key)
+    except TypeError:
+        return make()
+    nodes = source.__dict__.get('_interned_forwarders')
+    if nodes is None:
+        nodes = source.__dict__['_interned_forwarders'] = weakref.WeakValueDictionary()
+    node = nodes.get(intern_key)
+    if node is None:
+        node = make()
+        if is_observable(node):
+            nodes[intern_key] = node
+    return node
+
+
+def add_reactive_forwarders(cl: Any, functions: Iterable[Tuple[str, Callable]], interned: bool = False):
+    """
+    For operators and methods that don't modify a state of an object (__neg_, etc.). If `interned`, the forwarders
+    (taking one argument) return the same node for the same argument (see `interned_forwarder`).
     """
 
     def add_one(cl: Any, name, func):
-        def wrapped(self, *args):
-              # fixme: we should rather forward to the _target, not to __eval__
-            reactive_f = reactive(func)
+        reactive_f = None
 
-            prefix = ''
-            if hasattr(self, '__notifier__'):
-                preifx = self.__notifier__().name + '.'
+        def wrapped(self, *args):
+            # fixme: we should rather forward to the _target, not to __eval__
+            nonlocal reactive_f
+            if reactive_f is None:
+                # created on the first use, so importing doesn't pay for wrapping dozens of operators
+                reactive_f = reactive(func)
+            if interned:
+                return interned_forwarder(self, name, args[0], lambda: reactive_f(self, *args))
             return reactive_f(self, *args)
 
         setattr(cl, name, wrapped)